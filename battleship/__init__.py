@@ -0,0 +1,97 @@
+from importlib import import_module
+from typing import Any
+
+from .bitboard import (
+    BitBoard,
+    Fleet,
+    GameConfig,
+    Placement,
+    placements,
+    random_fleet,
+)
+from .board import Board
+from .enums import Direction, GameType, Player, Ship, ShipState, ship_names
+from .errors import InvalidGuessError, InvalidShipPlacementError
+from .state import GameState
+
+# names from modules that need numpy or are only used by the tools, imported
+# on first access so that importing the game itself stays fast
+lazy_names = {
+    "MonteCarloGuess": "ai",
+    "ai_strategies": "ai",
+    "budgeted_strategies": "ai",
+    "density_guess": "ai",
+    "heuristic_guess": "ai",
+    "BatchEnv": "batch",
+    "batch_policies": "batch",
+    "FleetLibrary": "fleets",
+    "anneal_fleets": "fleets",
+    "Instrumentation": "instrument",
+    "instrumentation": "instrument",
+    "count_layouts": "layouts",
+    "occupancy": "layouts",
+    "GameRecord": "record",
+    "GameRecordReader": "record",
+    "GameRecordWriter": "record",
+    "record_games": "record",
+    "GameServer": "server",
+    "GameResult": "simulation",
+    "play_ai_game": "simulation",
+    "simulate": "simulation",
+    "simulate_batch": "simulation",
+    "simulate_summary": "simulation",
+    "tournament": "tournament",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = lazy_names.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "BatchEnv",
+    "BitBoard",
+    "Board",
+    "Direction",
+    "Fleet",
+    "FleetLibrary",
+    "GameConfig",
+    "GameRecord",
+    "GameRecordReader",
+    "GameRecordWriter",
+    "GameResult",
+    "GameServer",
+    "GameState",
+    "GameType",
+    "Instrumentation",
+    "InvalidGuessError",
+    "InvalidShipPlacementError",
+    "MonteCarloGuess",
+    "Placement",
+    "Player",
+    "Ship",
+    "ShipState",
+    "ai_strategies",
+    "anneal_fleets",
+    "batch_policies",
+    "budgeted_strategies",
+    "count_layouts",
+    "density_guess",
+    "heuristic_guess",
+    "instrumentation",
+    "occupancy",
+    "placements",
+    "play_ai_game",
+    "random_fleet",
+    "record_games",
+    "ship_names",
+    "simulate",
+    "simulate_batch",
+    "simulate_summary",
+    "tournament",
+]
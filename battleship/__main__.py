@@ -0,0 +1,35 @@
+import sys
+
+if __name__ == "__main__":
+    # each tool is imported only when it is run, so starting a game does not
+    # load numpy or the server
+    if sys.argv[1:2] == ["tournament"]:
+        from .tournament import tournament_main
+
+        tournament_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["serve"]:
+        from .server import server_main
+
+        server_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["profile"]:
+        from .instrument import profile_main
+
+        profile_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["layouts"]:
+        from .layouts import layouts_main
+
+        layouts_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["fleets"]:
+        from .fleets import fleets_main
+
+        fleets_main(sys.argv[2:])
+    elif sys.argv[1:2] == ["book"]:
+        from .book import book_main
+
+        book_main(sys.argv[2:])
+    else:
+        from .board import Board
+
+        board = Board()
+
+        board.main()
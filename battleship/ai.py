@@ -0,0 +1,845 @@
+from __future__ import annotations
+
+from collections import Counter
+from functools import lru_cache
+from math import lcm, log2
+from random import choice, randrange, shuffle
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .bitboard import BitBoard, GameConfig, iter_bits, placement_lengths, standard
+from .book import BOOK_PATH, OpeningBook
+from .enums import Direction, Player
+from .layouts import CACHE_DIR, cached_layout_counts
+from .symmetry import ZOBRIST_MASK, zobrist_keys
+
+if TYPE_CHECKING:
+    from .state import GameState
+
+
+HIT_WEIGHT = 50.0
+HIT_POWERS = HIT_WEIGHT ** np.arange(11)
+
+
+def afloat_lengths(board: GameState, target: Player) -> list[int]:
+    ships = getattr(board, f"player{target.value}_ships")
+    return [
+        length
+        for ship, length in board.config.fleet.items()
+        if not (ship in ships and ships[ship]["sunk"])
+    ]
+
+
+@lru_cache(maxsize=None)
+def parity_cells(config: GameConfig, length: int, offset: int) -> list[int]:
+    # the cells (y * width + x) on every length-th diagonal; any ship at least
+    # `length` long covers one of them, so hunting only these cannot miss a ship
+    return [
+        cell
+        for cell in range(config.cells)
+        if (cell // config.width + cell % config.width) % length == offset
+    ]
+
+
+class HuntCells:
+    # the untried cells of one parity pattern as an indexed set: a list for
+    # uniform O(1) picks plus each cell's position for O(1) removal
+    __slots__ = ("length", "offset", "cells", "positions", "known")
+
+    def __init__(
+        self, config: GameConfig, length: int, offset: int, guessed: int
+    ) -> None:
+        self.length = length
+        self.offset = offset
+        self.cells = [
+            cell
+            for cell in parity_cells(config, length, offset % length)
+            if not guessed >> cell & 1
+        ]
+        self.positions = {cell: index for index, cell in enumerate(self.cells)}
+        self.known = guessed
+
+    def discard(self, cell: int) -> None:
+        index = self.positions.pop(cell, None)
+        if index is None:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[index] = last
+            self.positions[last] = index
+
+    def sync(self, guessed: int) -> bool:
+        # drops cells guessed since the last move; False when the board is
+        # not a continuation of the one this set was built for
+        if self.known & ~guessed:
+            return False
+        for cell in iter_bits(guessed & ~self.known):
+            self.discard(cell)
+        self.known = guessed
+        return True
+
+
+def hunt_cell(board: GameState, player: Player) -> int:
+    # an untried cell on the parity pattern for the smallest ship still afloat
+    target = Player.ONE if player == Player.TWO else Player.TWO
+    bits: BitBoard = getattr(board, f"player{target.value}_bits")
+    length = min(afloat_lengths(board, target))
+    key = ("hunt", player)
+    hunt: HuntCells | None = board.ai_cache.get(key)
+    if hunt is None or hunt.length != length or not hunt.sync(bits.guessed):
+        # the offset is drawn once per game and kept as the pattern widens;
+        # drawing it modulo a multiple of every ship length keeps each
+        # diagonal equally likely
+        offset = (
+            hunt.offset
+            if hunt is not None
+            else randrange(lcm(*board.config.placement_lengths))
+        )
+        hunt = HuntCells(board.config, length, offset, bits.guessed)
+        board.ai_cache[key] = hunt
+    if hunt.cells:
+        return choice(hunt.cells)
+    # only reachable while a hit is still being chased
+    return choice(list(iter_bits(~bits.guessed & ((1 << board.config.cells) - 1))))
+
+
+def heuristic_guess(board: GameState, player: Player) -> tuple[int, int]:
+    target = Player.ONE if player == Player.TWO else Player.TWO
+    coord: tuple[int, int] = (0, 0)
+    width = board.config.width
+    max_x = width - 1
+    max_y = board.config.height - 1
+    guessed = getattr(board, f"player{target.value}_bits").guessed
+
+    def unavailable(coord: tuple[int, int]) -> bool:
+        # off the board or already guessed, checked against the bitboard so
+        # the cost does not grow with the number of guesses
+        x, y = coord
+        if not (0 <= x <= max_x and 0 <= y <= max_y):
+            return True
+        return bool(guessed >> (y * width + x) & 1)
+
+    def random_coord() -> tuple[int, int]:
+        cell = hunt_cell(board, player)
+        return (cell % width, cell // width)
+
+    def approach() -> tuple[int, int]:
+        # get a random adjacent coordinate
+        x, y = choice(ai_x)
+        coord = (x, y)
+        num_attempted = 0
+        while unavailable(coord):
+            if num_attempted > 10:
+                # get a random coordinate
+                coord = random_coord()
+                break
+            which = choice([0, 1])
+            if which == 0:
+                coord = (
+                    x + choice([-1, 1]),
+                    y,
+                )
+            elif which == 1:
+                coord = (
+                    x,
+                    y + choice([-1, 1]),
+                )
+            num_attempted += 1
+        return coord
+
+    ai_x = board.get_hit_coords(target)
+    if not ai_x:
+        coord = random_coord()
+    else:
+        if len(ai_x) == 1:
+            coord = approach()
+
+        else:
+            coords_in_v_line: list[tuple[int, int]] = []
+            coords_in_h_line: list[tuple[int, int]] = []
+            for x, y in ai_x:
+                if x == ai_x[0][0]:
+                    coords_in_v_line.append((x, y))
+            for x, y in ai_x:
+                if y == ai_x[0][1]:
+                    coords_in_h_line.append((x, y))
+            if len(coords_in_v_line) > 1:
+                # get the top or bottom coordinate of a random coordinate in the vertical line
+                coord = (-1, -1)
+                num_attempted = 0
+                while unavailable(coord):
+                    if num_attempted > 10:
+                        coord = approach()
+                        break
+                    x, y = choice(coords_in_v_line)
+                    coord = (
+                        x,
+                        y + choice([-1, 1]),
+                    )
+                    num_attempted += 1
+            elif len(coords_in_h_line) > 1:
+                # get the left or right coordinate of a random coordinate in the horizontal line
+                coord = (-1, -1)
+                num_attempted = 0
+                while unavailable(coord):
+                    if num_attempted > 10:
+                        coord = approach()
+                        break
+                    x, y = choice(coords_in_h_line)
+                    coord = (
+                        x + choice([-1, 1]),
+                        y,
+                    )
+                    num_attempted += 1
+            else:
+                # get a random adjacent coordinate
+                x, y = ai_x[0]
+                coord = (x, y)
+                num_attempted = 0
+                while unavailable(coord):
+                    if num_attempted > 10:
+                        coord = approach()
+                        break
+                    which = choice([0, 1])
+                    if which == 0:
+                        coord = (
+                            x + choice([-1, 1]),
+                            y,
+                        )
+                    elif which == 1:
+                        coord = (
+                            x,
+                            y + choice([-1, 1]),
+                        )
+                    num_attempted += 1
+    return (coord[1], coord[0])
+
+
+def mask_array(mask: int, width: int = 10, height: int = 10) -> np.ndarray:
+    cells = width * height
+    return (
+        np.unpackbits(
+            np.frombuffer(mask.to_bytes((cells + 7) // 8, "little"), dtype=np.uint8),
+            bitorder="little",
+        )[:cells]
+        .reshape(height, width)
+        .astype(bool)
+    )
+
+
+# one row per distinct placement, with the ship length each row belongs to
+placement_matrix = np.array(
+    [
+        mask_array(placement.mask).ravel()
+        for length_placements in placement_lengths.values()
+        for placement in length_placements
+    ],
+    dtype=float,
+)
+placement_matrix_lengths = np.array(
+    [
+        length
+        for length, length_placements in placement_lengths.items()
+        for _ in length_placements
+    ]
+)
+
+
+def density_map(
+    blocked: int, hits: int, lengths: list[int], config: GameConfig = standard
+) -> np.ndarray:
+    # count every placement of every remaining ship that avoids blocked cells;
+    # placements through unresolved hits are weighted up so the AI finishes ships
+    if config is not standard:
+        return window_density_map(blocked, hits, lengths, config)
+    blocked_cells = placement_matrix @ mask_array(blocked).ravel()
+    covered_hits = (placement_matrix @ mask_array(hits).ravel()).astype(int)
+    weight = (
+        (blocked_cells == 0)
+        * HIT_POWERS[covered_hits]
+        * np.bincount(lengths, minlength=11)[placement_matrix_lengths]
+    )
+    return (weight @ placement_matrix).reshape(10, 10)
+
+
+def spread_windows(weight: np.ndarray, length: int, axis: int) -> np.ndarray:
+    # each window's weight added to the `length` cells it covers, where
+    # weight[y, x] is the window starting at (x, y) running along `axis`
+    padding = [(0, 0), (0, 0)]
+    padding[axis] = (length - 1, length - 1)
+    return sliding_window_view(np.pad(weight, padding), length, axis).sum(-1)
+
+
+def window_density_map(
+    blocked: int, hits: int, lengths: list[int], config: GameConfig
+) -> np.ndarray:
+    # the same counts as density_map without a placements x cells matrix,
+    # which would not fit for big boards: slide a ship-length window along
+    # each row and column, then spread each window's weight back over its cells
+    blocked_cells = mask_array(blocked, config.width, config.height).astype(int)
+    hit_cells = mask_array(hits, config.width, config.height).astype(int)
+    heat = np.zeros((config.height, config.width))
+    for length, count in Counter(lengths).items():
+        # a single cell is one placement, not one per direction
+        for axis in (1,) if length == 1 else (0, 1):
+            if blocked_cells.shape[axis] < length:
+                continue
+            windows_blocked = sliding_window_view(blocked_cells, length, axis).sum(-1)
+            windows_hits = sliding_window_view(hit_cells, length, axis).sum(-1)
+            weight = count * (windows_blocked == 0) * HIT_WEIGHT**windows_hits
+            heat += spread_windows(weight, length, axis)
+    return heat
+
+
+def density_guess(board: GameState, player: Player) -> tuple[int, int]:
+    target = Player.ONE if player == Player.TWO else Player.TWO
+    bits: BitBoard = getattr(board, f"player{target.value}_bits")
+    config = board.config
+    heat = density_map(
+        bits.misses | bits.sunk,
+        bits.hits & ~bits.sunk,
+        afloat_lengths(board, target),
+        config,
+    )
+    heat[mask_array(bits.guessed, config.width, config.height)] = -1
+    index = choice(np.flatnonzero(heat == heat.max()))
+    return (int(index // config.width), int(index % config.width))
+
+
+@lru_cache(maxsize=None)
+def placement_ids(config: GameConfig) -> dict[int, int]:
+    # position of each placement in placement_lengths order, which for the
+    # standard config is its row in placement_matrix; masks of different
+    # lengths never collide, so the mask alone identifies the placement
+    return {
+        placement.mask: number
+        for number, placement in enumerate(
+            placement
+            for length_placements in config.placement_lengths.values()
+            for placement in length_placements
+        )
+    }
+
+
+@lru_cache(maxsize=None)
+def placement_masks(config: GameConfig) -> dict[int, list[int]]:
+    return {
+        length: [placement.mask for placement in length_placements]
+        for length, length_placements in config.placement_lengths.items()
+    }
+
+
+@lru_cache(maxsize=None)
+def cell_placements(config: GameConfig) -> dict[int, list[list[int]]]:
+    # placements of each length through each cell
+    table: dict[int, list[list[int]]] = {}
+    for length, masks in placement_masks(config).items():
+        table[length] = [[] for _ in range(config.cells)]
+        for mask in masks:
+            for cell in iter_bits(mask):
+                table[length][cell].append(mask)
+    return table
+
+
+@lru_cache(maxsize=None)
+def placement_cell_table(config: GameConfig) -> np.ndarray:
+    # per placement id, the cells it covers, in the first `length` columns
+    longest = max(config.placement_lengths)
+    table = np.zeros((sum(map(len, config.placement_lengths.values())), longest), int)
+    for number, placement in enumerate(
+        placement
+        for length_placements in config.placement_lengths.values()
+        for placement in length_placements
+    ):
+        cells = list(iter_bits(placement.mask))
+        table[number, : len(cells)] = cells
+    return table
+
+
+@lru_cache(maxsize=None)
+def placement_windows(config: GameConfig) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    # per placement id, group * cells + first cell, where group indexes the
+    # (length, axis) pairs returned alongside; axis 1 runs along a row
+    groups = [(length, axis) for length in config.placement_lengths for axis in (0, 1)]
+    windows = [
+        groups.index((length, 1 if placement.direction == Direction.HORIZONTAL else 0))
+        * config.cells
+        + placement.y * config.width
+        + placement.x
+        for length, length_placements in config.placement_lengths.items()
+        for placement in length_placements
+    ]
+    return np.array(windows), groups
+
+
+def placement_heat(ids: list[int], config: GameConfig) -> np.ndarray:
+    # how many of the placements cover each cell, counted per first cell and
+    # spread over the window like window_density_map rather than cell by cell
+    windows, groups = placement_windows(config)
+    starts = np.bincount(windows[ids], minlength=len(groups) * config.cells).reshape(
+        len(groups), config.height, config.width
+    )
+    heat = np.zeros((config.height, config.width))
+    for (length, axis), group_starts in zip(groups, starts):
+        if group_starts.shape[axis] < length:
+            continue
+        count = group_starts.shape[axis] - length + 1
+        heat += spread_windows(
+            group_starts[:count] if axis == 0 else group_starts[:, :count],
+            length,
+            axis,
+        )
+    return heat
+
+
+# a sampled fleet: (ship, mask, placement id) for each ship that was afloat
+# when sampled; the id is looked up once here, as hashing a big board's
+# masks is not cheap
+Sample = tuple[tuple[str, int, int], ...]
+
+
+def sample_fleet(
+    ships: list[str], blocked: int, hits: int, config: GameConfig = standard
+) -> Sample | None:
+    # places the given ships off blocked cells so that together they cover
+    # every hit; ships go through uncovered hits first, which keeps late-game
+    # sampling from being almost all rejections. None on a dead end
+    through_cell = cell_placements(config)
+    all_masks = placement_masks(config)
+    ids = placement_ids(config)
+    occupied = blocked
+    uncovered = hits
+    remaining = list(ships)
+    shuffle(remaining)
+    fleet = []
+    while remaining:
+        if uncovered:
+            cell = (uncovered & -uncovered).bit_length() - 1
+            options = [
+                (ship, mask)
+                for ship in remaining
+                for mask in through_cell[config.fleet[ship]][cell]
+                if not mask & occupied and mask & ~hits
+            ]
+        else:
+            # guess and check first, which stays uniform over the options and
+            # almost always succeeds on an open board
+            ship = remaining[-1]
+            masks = all_masks[config.fleet[ship]]
+            for _ in range(8):
+                mask = choice(masks)
+                if not mask & occupied and mask & ~hits:
+                    options = [(ship, mask)]
+                    break
+            else:
+                options = [
+                    (ship, mask)
+                    for mask in masks
+                    if not mask & occupied and mask & ~hits
+                ]
+        if not options:
+            return None
+        ship, mask = choice(options)
+        remaining.remove(ship)
+        fleet.append((ship, mask, ids[mask]))
+        occupied |= mask
+        uncovered &= ~mask
+    if uncovered:
+        return None
+    return tuple(fleet)
+
+
+def sample_consistent(sample: Sample, bits: BitBoard, sunk_ships: set[str]) -> bool:
+    # whether a fleet sampled earlier still explains everything seen since
+    covered = 0
+    for ship, mask, _ in sample:
+        if ship in sunk_ships:
+            if mask & ~bits.sunk:
+                return False
+        elif mask & (bits.misses | bits.sunk) or not mask & ~bits.hits:
+            return False
+        covered |= mask
+    return not bits.hits & ~covered
+
+
+class MonteCarloGuess:
+    # fires at the cell most often occupied across random fleets consistent
+    # with the board so far. Samples are kept in the board's ai_cache between
+    # moves, filtered after every shot and only topped back up to `samples`
+    # once fewer than `min_samples` survive, spending at most `budget` seconds
+    def __init__(
+        self, samples: int = 1000, min_samples: int = 250, budget: float = 0.05
+    ) -> None:
+        self.samples = samples
+        self.min_samples = min_samples
+        self.budget = budget
+
+    def pool(self, board: GameState, player: Player, deadline: float) -> list[Sample]:
+        # the fleets kept from earlier moves that still fit the board, topped
+        # up with fresh samples if too few survived
+        target = Player.ONE if player == Player.TWO else Player.TWO
+        bits: BitBoard = getattr(board, f"player{target.value}_bits")
+        ships = getattr(board, f"player{target.value}_ships")
+        sunk_ships = {ship for ship in ships if ships[ship]["sunk"]}
+        config = board.config
+        afloat = [ship for ship in config.fleet if ship not in sunk_ships]
+
+        key = (self, player)
+        cached = board.ai_cache.get(key, [])
+        pool = []
+        # checking kept samples counts against the deadline too; any left
+        # unchecked when it passes stay cached for the next move
+        unchecked: list[Sample] = []
+        for index, sample in enumerate(cached):
+            if index % 64 == 0 and perf_counter() > deadline:
+                unchecked = cached[index:]
+                break
+            if sample_consistent(sample, bits, sunk_ships):
+                pool.append(sample)
+        if len(pool) < self.min_samples:
+            blocked = bits.misses | bits.sunk
+            hits = bits.hits & ~bits.sunk
+            while len(pool) < self.samples and perf_counter() < deadline:
+                sample = sample_fleet(afloat, blocked, hits, config)
+                if sample is not None:
+                    pool.append(sample)
+        board.ai_cache[key] = pool + unchecked
+        return pool
+
+    def __call__(self, board: GameState, player: Player) -> tuple[int, int]:
+        # a fifth of the budget is left for the heat map, which on a big
+        # board takes a few milliseconds
+        pool = self.pool(board, player, perf_counter() + 0.8 * self.budget)
+        if not pool:
+            return density_guess(board, player)
+        target = Player.ONE if player == Player.TWO else Player.TWO
+        bits: BitBoard = getattr(board, f"player{target.value}_bits")
+        ships = getattr(board, f"player{target.value}_ships")
+        sunk_ships = {ship for ship in ships if ships[ship]["sunk"]}
+        config = board.config
+
+        ids = [
+            number
+            for sample in pool
+            for ship, _, number in sample
+            if ship not in sunk_ships
+        ]
+        if config is standard:
+            counts = np.bincount(ids, minlength=len(placement_matrix))
+            heat = (counts @ placement_matrix).reshape(10, 10)
+        else:
+            heat = placement_heat(ids, config)
+        heat[mask_array(bits.guessed, config.width, config.height)] = -1
+        index = choice(np.flatnonzero(heat == heat.max()))
+        return (int(index // config.width), int(index % config.width))
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class Particles:
+    # the sampled fleets as arrays, for branching on hypothetical shots:
+    # which afloat ship (by fleet position) covers each unhit cell, -1 for
+    # water, and how many unhit cells each ship has left
+    __slots__ = ("config", "ship_of_cell", "ship_hp")
+
+    def __init__(
+        self,
+        pool: list[Sample],
+        bits: BitBoard,
+        sunk_ships: set[str],
+        config: GameConfig,
+    ) -> None:
+        self.config = config
+        numbers = {ship: number for number, ship in enumerate(config.fleet)}
+        self.ship_of_cell = np.full((len(pool), config.cells), -1, dtype=np.int16)
+        self.ship_hp = np.zeros((len(pool), len(numbers)), dtype=np.int16)
+        # (row, ship, placement id) of every afloat ship, filled in a length
+        # at a time from the placements' cells rather than mask by mask
+        entries = [
+            (row, numbers[ship], number)
+            for row, sample in enumerate(pool)
+            for ship, _, number in sample
+            if ship not in sunk_ships
+        ]
+        if not entries:
+            return
+        rows, ships, ids = np.array(entries).T
+        lengths = np.array(list(config.fleet.values()))[ships]
+        hit = mask_array(bits.hits, config.width, config.height).ravel()
+        cell_table = placement_cell_table(config)
+        for length in np.unique(lengths):
+            selected = lengths == length
+            cells = cell_table[ids[selected], :length]
+            self.ship_of_cell[rows[selected, None], cells] = ships[selected, None]
+            self.ship_hp[rows[selected], ships[selected]] = (~hit[cells]).sum(axis=1)
+        self.ship_of_cell[:, hit] = -1
+
+
+class SearchGuess(MonteCarloGuess):
+    # looks up to `max_depth` shots ahead over the fleets MonteCarloGuess
+    # samples: expectimax on the expected number of hits, where a shot splits
+    # the fleets by what it would reveal (a miss, a hit, or which ship sinks)
+    # and only the `branching` likeliest cells are tried at each step. Depths
+    # are searched in turn until `budget` runs out and the deepest finished
+    # search is played; the one-shot answer is known before searching starts,
+    # so a legal shot always comes back in time. Node values go in a
+    # transposition table in ai_cache keyed on Zobrist hashes, so the part of
+    # the tree under the shot actually played is reused on the next move
+    def __init__(
+        self,
+        samples: int = 400,
+        min_samples: int = 150,
+        budget: float = 0.1,
+        max_depth: int = 3,
+        branching: int = 6,
+        info_weight: float = 0.1,
+    ) -> None:
+        # sampling may take up to half the budget, the search gets the rest
+        super().__init__(samples, min_samples, budget / 2)
+        self.search_budget = budget
+        self.max_depth = max_depth
+        self.branching = branching
+        self.info_weight = info_weight
+
+    def __call__(self, board: GameState, player: Player) -> tuple[int, int]:
+        # a node can run a few milliseconds past the deadline on a big board
+        # before it notices, so the search stops a tenth of the budget early
+        deadline = perf_counter() + 0.9 * self.search_budget
+        pool = self.pool(board, player, deadline - self.budget)
+        if not pool:
+            return density_guess(board, player)
+        target = Player.ONE if player == Player.TWO else Player.TWO
+        bits: BitBoard = getattr(board, f"player{target.value}_bits")
+        ships = getattr(board, f"player{target.value}_ships")
+        sunk_ships = {ship for ship in ships if ships[ship]["sunk"]}
+        config = board.config
+        particles = Particles(pool, bits, sunk_ships, config)
+
+        table: dict[tuple[int, int, int], float] = board.ai_cache.setdefault(
+            (self, player, "table"), {}
+        )
+        if len(table) > 1 << 18:
+            table.clear()
+        root = getattr(board, f"player{target.value}_hash") & ZOBRIST_MASK
+        rows = np.arange(len(pool))
+        guessed = mask_array(bits.guessed, config.width, config.height).ravel()
+
+        best = int(np.argmax(self.hit_chances(particles, rows, guessed)))
+        # building the particles counts against the deadline too; past it,
+        # the one-shot answer is played
+        for depth in range(2, self.max_depth + 1):
+            if perf_counter() > deadline:
+                break
+            try:
+                best = self.search(
+                    particles,
+                    rows,
+                    particles.ship_hp,
+                    guessed,
+                    root,
+                    depth,
+                    deadline,
+                    table,
+                )
+            except SearchTimeout:
+                break
+        return (best // config.width, best % config.width)
+
+    def hit_chances(
+        self, particles: Particles, rows: np.ndarray, guessed: np.ndarray
+    ) -> np.ndarray:
+        chances = (particles.ship_of_cell[rows] >= 0).mean(axis=0)
+        chances[guessed] = -1
+        return chances
+
+    def outcomes(
+        self, particles: Particles, rows: np.ndarray, ship_hp: np.ndarray, cell: int
+    ) -> list[tuple[np.ndarray, np.ndarray, int, int]]:
+        # (rows, their ship hp after the shot, whether it hits, the ship it
+        # sinks or -1) for each distinct thing the shot could reveal
+        ships = particles.ship_of_cell[rows, cell]
+        hit = ships >= 0
+        branches = []
+        if not hit.all():
+            branches.append((~hit, 0, -1))
+        sinks = hit & (ship_hp[np.arange(len(rows)), np.maximum(ships, 0)] == 1)
+        if (hit & ~sinks).any():
+            branches.append((hit & ~sinks, 1, -1))
+        for ship in np.unique(ships[sinks]):
+            branches.append((sinks & (ships == ship), 1, int(ship)))
+        children = []
+        for selected, hits, sunk in branches:
+            child_hp = ship_hp[selected]
+            if hits:
+                child_hp = child_hp.copy()
+                child_hp[np.arange(len(child_hp)), ships[selected]] -= 1
+            children.append((rows[selected], child_hp, hits, sunk))
+        return children
+
+    def value(
+        self,
+        particles: Particles,
+        rows: np.ndarray,
+        ship_hp: np.ndarray,
+        guessed: np.ndarray,
+        key: tuple[int, int],
+        depth: int,
+        deadline: float,
+        table: dict[tuple[int, int, int], float],
+    ) -> float:
+        # expected hits over the next `depth` shots from this position
+        cached = table.get((*key, depth))
+        if cached is not None:
+            return cached
+        if perf_counter() > deadline:
+            raise SearchTimeout
+        chances = self.hit_chances(particles, rows, guessed)
+        if depth == 1:
+            value = max(float(chances.max()), 0.0)
+        else:
+            value = 0.0
+            for cell in np.argsort(chances)[::-1][: self.branching]:
+                if chances[cell] < 0:
+                    break
+                value = max(
+                    value,
+                    self.expectation(
+                        particles,
+                        rows,
+                        ship_hp,
+                        guessed,
+                        key,
+                        int(cell),
+                        depth,
+                        deadline,
+                        table,
+                    )[0],
+                )
+        table[(*key, depth)] = value
+        return value
+
+    def expectation(
+        self,
+        particles: Particles,
+        rows: np.ndarray,
+        ship_hp: np.ndarray,
+        guessed: np.ndarray,
+        key: tuple[int, int],
+        cell: int,
+        depth: int,
+        deadline: float,
+        table: dict[tuple[int, int, int], float],
+    ) -> tuple[float, float]:
+        # expected hits from shooting `cell` and then playing on, and the
+        # information the shot gives (entropy of what it reveals, in bits)
+        # hypothetical positions are keyed on the identity image's Zobrist
+        # hash and a bit per ship they sink, so a shot that is then played
+        # for real without sinking lands on the same key
+        miss_keys, hit_keys, _ = zobrist_keys(particles.config)
+        child_guessed = guessed.copy()
+        child_guessed[cell] = True
+        total = 0.0
+        information = 0.0
+        for child_rows, child_hp, hits, sunk in self.outcomes(
+            particles, rows, ship_hp, cell
+        ):
+            chance = len(child_rows) / len(rows)
+            child_key = (
+                key[0] ^ (hit_keys[cell] if hits else miss_keys[cell]) & ZOBRIST_MASK,
+                key[1] | (1 << sunk if sunk >= 0 else 0),
+            )
+            total += chance * (
+                hits
+                + self.value(
+                    particles,
+                    child_rows,
+                    child_hp,
+                    child_guessed,
+                    child_key,
+                    depth - 1,
+                    deadline,
+                    table,
+                )
+            )
+            information -= chance * log2(chance)
+        return total, information
+
+    def search(
+        self,
+        particles: Particles,
+        rows: np.ndarray,
+        ship_hp: np.ndarray,
+        guessed: np.ndarray,
+        root: int,
+        depth: int,
+        deadline: float,
+        table: dict[tuple[int, int, int], float],
+    ) -> int:
+        chances = self.hit_chances(particles, rows, guessed)
+        best = -1
+        best_score = -1.0
+        for cell in np.argsort(chances)[::-1][: self.branching]:
+            if chances[cell] < 0:
+                break
+            expected, information = self.expectation(
+                particles,
+                rows,
+                ship_hp,
+                guessed,
+                (root, 0),
+                int(cell),
+                depth,
+                deadline,
+                table,
+            )
+            # information breaks near-ties in expected hits toward shots
+            # that narrow down the fleets the most
+            score = expected + self.info_weight * information
+            if score > best_score:
+                best, best_score = int(cell), score
+        return best
+
+
+def opening_guess(
+    board: GameState, player: Player, cache_dir: str = CACHE_DIR
+) -> tuple[int, int]:
+    # density_guess made repeatable for the opening book: ties go to the
+    # lowest cell, and an untouched standard board uses the exact per-cell
+    # layout counts rather than the density estimate when `layouts` (or
+    # `book`) has cached them; counting them here would stall the first move
+    target = Player.ONE if player == Player.TWO else Player.TWO
+    bits: BitBoard = getattr(board, f"player{target.value}_bits")
+    config = board.config
+    counts = None
+    if not bits.guessed and config is standard:
+        counts = cached_layout_counts(config, cache_dir)
+    if counts is not None:
+        heat = counts.astype(float)
+    else:
+        heat = density_map(
+            bits.misses | bits.sunk,
+            bits.hits & ~bits.sunk,
+            afloat_lengths(board, target),
+            config,
+        )
+        heat[mask_array(bits.guessed, config.width, config.height)] = -1
+    index = int(np.argmax(heat))
+    return (index // config.width, index % config.width)
+
+
+ai_strategies: dict[str, Callable[[GameState, Player], tuple[int, int]]] = {
+    "heuristic": heuristic_guess,
+    "density": density_guess,
+    "montecarlo": MonteCarloGuess(),
+    # reads the book `python -m battleship book` writes, when there is one
+    "book": OpeningBook(opening_guess, density_guess, path=BOOK_PATH, flag="r"),
+    "search": SearchGuess(),
+}
+# strategies that spend a time budget on every move, so a 1000-game run of
+# them takes minutes; bulk runs leave them out unless they are named
+budgeted_strategies = frozenset({"montecarlo", "search"})
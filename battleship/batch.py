@@ -0,0 +1,238 @@
+import numpy as np
+
+from .ai import mask_array
+from .bitboard import Fleet, placement_lengths, placements
+from .enums import ShipState, ship_names
+from .errors import InvalidGuessError
+
+# cells covered by each placement, one (placements, 100) matrix per length,
+# in the same order as placement_lengths so row numbers are placement numbers
+placement_cells: dict[int, np.ndarray] = {
+    length: np.array(
+        [mask_array(placement.mask).ravel() for placement in length_placements]
+    )
+    for length, length_placements in placement_lengths.items()
+}
+ship_lengths = np.array([value.value for value in ship_names.values()], dtype=np.int8)
+diagonals = np.add.outer(np.arange(10), np.arange(10)).ravel()
+# parity_patterns[length - 1, offset] marks the cells (row + col) % length ==
+# offset, as in parity_cells
+parity_patterns = np.array(
+    [[diagonals % length == offset for offset in range(10)] for length in range(1, 11)]
+)
+# column_from[cell, d] is whether the cell d columns left of `cell` is on the
+# same row, column_to[cell, d] the same to the right
+columns = np.arange(100) % 10
+column_from = columns[:, None] >= np.arange(3)
+column_to = columns[:, None] < 10 - np.arange(3)
+# ship s's bit in HuntTarget's per-game afloat mask
+ship_bits = (2 << np.arange(len(ship_names))).astype(np.uint8)
+
+
+class BatchEnv:
+    # N target boards stepped in lockstep; every field is an array with the
+    # game on the first axis, so one call advances every game at once
+    def __init__(self, games: int, random_seed: int | None = None) -> None:
+        self.games = games
+        self.rng = np.random.default_rng(random_seed)
+        # ship number (index into ship_names) per cell, -1 for water
+        self.ships = np.full((games, 10, 10), -1, dtype=np.int8)
+        self.shots = np.zeros((games, 10, 10), dtype=bool)
+        # each ship's placement number, i.e. its row in placements[ship]
+        self.fleets = np.zeros((games, len(ship_names)), dtype=np.int16)
+        self.ship_hp = np.zeros((games, len(ship_names)), dtype=np.int8)
+        self.ships_left = np.zeros(games, dtype=np.int8)
+        self.randomize()
+
+    def randomize(self) -> None:
+        # same distribution as place_ai_ships: each ship in turn is placed
+        # uniformly among the placements that avoid the ships before it, by
+        # drawing again for the games whose draw overlapped
+        occupied = np.zeros((self.games, 100), dtype=bool)
+        ships = np.full((self.games, 100), -1, dtype=np.int8)
+        for number, value in enumerate(ship_names.values()):
+            cells = placement_cells[value.value]
+            chosen = np.empty(self.games, dtype=np.int64)
+            pending = np.arange(self.games)
+            while len(pending):
+                draws = self.rng.integers(len(cells), size=len(pending))
+                clash = (occupied[pending] & cells[draws]).any(axis=1)
+                chosen[pending[~clash]] = draws[~clash]
+                pending = pending[clash]
+            covered = cells[chosen]
+            occupied |= covered
+            ships = np.where(covered, np.int8(number), ships)
+            self.fleets[:, number] = chosen
+
+        self.ships = ships.reshape(self.games, 10, 10)
+        self.shots[:] = False
+        self.ship_hp[:] = ship_lengths
+        self.ships_left[:] = len(ship_names)
+
+    def fire(self, coords: np.ndarray, active: np.ndarray | None = None) -> np.ndarray:
+        # coords is (N, 2) of (row, col), one shot per game; returns the
+        # ShipState value of each shot, EMPTY for games left out by `active`.
+        # The shot that sinks a game's last ship reports SUNK, see `done`
+        games = np.arange(self.games) if active is None else np.flatnonzero(active)
+        rows = coords[games, 0]
+        cols = coords[games, 1]
+        if self.shots[games, rows, cols].any():
+            game = games[self.shots[games, rows, cols]][0]
+            raise InvalidGuessError(
+                f"Game {game} has already guessed {tuple(coords[game].tolist())}"
+            )
+        self.shots[games, rows, cols] = True
+
+        results = np.full(self.games, ShipState.EMPTY.value, dtype=np.int8)
+        results[games] = ShipState.WRONG_GUESS.value
+        ship = self.ships[games, rows, cols]
+        hit = ship >= 0
+        games, ship = games[hit], ship[hit]
+        self.ship_hp[games, ship] -= 1
+        sunk = self.ship_hp[games, ship] == 0
+        results[games] = ShipState.HIT.value
+        results[games[sunk]] = ShipState.SUNK.value
+        self.ships_left[games[sunk]] -= 1
+        return results
+
+    @property
+    def done(self) -> np.ndarray:
+        return self.ships_left == 0
+
+    @property
+    def hits(self) -> np.ndarray:
+        return self.shots & (self.ships >= 0)
+
+    @property
+    def misses(self) -> np.ndarray:
+        return self.shots & (self.ships < 0)
+
+    @property
+    def sunk(self) -> np.ndarray:
+        # cells of sunk ships, all of which are hits; water (-1) indexes the
+        # extra always-False column
+        sunk_ships = np.concatenate(
+            [self.ship_hp == 0, np.zeros((self.games, 1), dtype=bool)], axis=1
+        )
+        return np.take_along_axis(
+            sunk_ships, self.ships.reshape(self.games, 100), axis=1
+        ).reshape(self.games, 10, 10)
+
+    def fleet(self, game: int) -> Fleet:
+        return tuple(
+            placements[ship][number]
+            for ship, number in zip(ship_names, self.fleets[game])
+        )
+
+
+class HuntTarget:
+    # heuristic_guess for every game of a BatchEnv at once: untried cells next
+    # to unsunk hits first, most of all those extending a line of two hits,
+    # and otherwise the parity pattern of the smallest ship afloat, shifted by
+    # each game's offset. Scores are kept between shots and updated around
+    # each shot rather than recomputed, see update
+    def __init__(self, env: BatchEnv, rng: np.random.Generator) -> None:
+        self.env = env
+        self.offsets = rng.integers(60, size=env.games)
+        # a random order over each game's cells breaks ties, drawn once per
+        # game rather than every shot
+        self.order = rng.permuted(
+            np.tile(np.arange(100, dtype=np.int32), (env.games, 1)), axis=1
+        )
+        self.scores = self.score(np.arange(env.games))
+
+    def score(self, games: np.ndarray) -> np.ndarray:
+        # cells are flattened to row * 10 + col; a shift by 10 moves a row
+        # and a shift by 1 a column, masked where it would wrap around
+        env = self.env
+        shots = env.shots[games].reshape(-1, 100)
+        # bit s + 1 of afloat is set while ship s is, so shifting it by the
+        # cell's ship number + 1 leaves the cell's state in bit 0, water's 0
+        afloat = (env.ship_hp[games] > 0) @ ship_bits
+        open_hits = shots & (
+            afloat[:, None] >> (env.ships[games].reshape(-1, 100) + 1).view(np.uint8)
+            & 1
+        ).view(bool)
+        adjacent = np.zeros_like(open_hits)
+        adjacent[:, 10:] |= open_hits[:, :-10]
+        adjacent[:, :-10] |= open_hits[:, 10:]
+        adjacent[:, 1:] |= open_hits[:, :-1] & column_from[1:, 1]
+        adjacent[:, :-1] |= open_hits[:, 1:] & column_to[:-1, 1]
+        line = np.zeros_like(open_hits)
+        line[:, 20:] |= open_hits[:, 10:-10] & open_hits[:, :-20]
+        line[:, :-20] |= open_hits[:, 10:-10] & open_hits[:, 20:]
+        line[:, 2:] |= open_hits[:, 1:-1] & open_hits[:, :-2] & column_from[2:, 2]
+        line[:, :-2] |= open_hits[:, 1:-1] & open_hits[:, 2:] & column_to[:-2, 2]
+
+        smallest = np.where(env.ship_hp[games] > 0, ship_lengths, 10).min(axis=1)
+        parity = parity_patterns[smallest - 1, self.offsets[games] % smallest]
+        scores = self.order[games] + (
+            parity * np.int32(128) + adjacent * np.int32(256) + line * np.int32(256)
+        )
+        return np.where(shots, np.int32(-1), scores)
+
+    def guess(self, games: np.ndarray | None = None) -> np.ndarray:
+        # (N, 2) coords, one shot per game; given `games`, only those games'
+        # shots are worked out and the rest are left at (0, 0)
+        if games is None:
+            cells = self.scores.argmax(axis=1)
+        else:
+            cells = np.zeros(self.env.games, dtype=np.int64)
+            cells[games] = self.scores[games].argmax(axis=1)
+        return np.stack(np.divmod(cells, 10), axis=1)
+
+    def open_hits(
+        self, games: np.ndarray, rows: np.ndarray, cols: np.ndarray
+    ) -> np.ndarray:
+        # whether each (row, col), which may be off the board, is a hit on a
+        # ship still afloat
+        env = self.env
+        on_board = (0 <= rows) & (rows < 10) & (0 <= cols) & (cols < 10)
+        rows, cols = np.where(on_board, rows, 0), np.where(on_board, cols, 0)
+        ships = env.ships[games, rows, cols]
+        return (
+            on_board
+            & env.shots[games, rows, cols]
+            & (ships >= 0)
+            & (env.ship_hp[games, ships] > 0)
+        )
+
+    def promote(
+        self, games: np.ndarray, rows: np.ndarray, cols: np.ndarray, level: int
+    ) -> None:
+        # raises untried cells to at least `level`: 1 next to an open hit, 2
+        # in line with two
+        on_board = (0 <= rows) & (rows < 10) & (0 <= cols) & (cols < 10)
+        games, cells = games[on_board], rows[on_board] * 10 + cols[on_board]
+        scores = self.scores[games, cells]
+        untried = scores >= 0
+        scores = scores & 255 | np.maximum(scores >> 8, level) << 8
+        self.scores[games[untried], cells[untried]] = scores[untried]
+
+    def update(self, coords: np.ndarray, results: np.ndarray) -> None:
+        # after env.fire(coords); games left out of the shot report EMPTY.
+        # A miss only rules out its cell, and a hit that sinks nothing also
+        # raises the cells it is next to or in line with; a sinking shot
+        # closes hits and can change the parity, so those games are rescored
+        cells = coords[:, 0] * 10 + coords[:, 1]
+        shot = np.flatnonzero(
+            (results == ShipState.WRONG_GUESS.value) | (results == ShipState.HIT.value)
+        )
+        self.scores[shot, cells[shot]] = -1
+        hit = np.flatnonzero(results == ShipState.HIT.value)
+        rows, cols = coords[hit, 0], coords[hit, 1]
+        for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            self.promote(hit, rows + dr, cols + dc, 1)
+            # with an open hit behind the new one, the cells beyond both ends
+            # of the pair are in line
+            behind = self.open_hits(hit, rows - dr, cols - dc)
+            games, line_rows, line_cols = hit[behind], rows[behind], cols[behind]
+            self.promote(games, line_rows + dr, line_cols + dc, 2)
+            self.promote(games, line_rows - 2 * dr, line_cols - 2 * dc, 2)
+        sunk = np.flatnonzero(results == ShipState.SUNK.value)
+        self.scores[sunk] = self.score(sunk)
+
+
+# vectorised counterparts of ai_strategies for simulate_batch, by the name
+# of the strategy they play like; only heuristic_guess has one so far
+batch_policies: dict[str, type[HuntTarget]] = {"heuristic": HuntTarget}
@@ -0,0 +1,246 @@
+import io
+import json
+import platform
+import subprocess
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from random import sample, seed
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable
+
+from .ai import ai_strategies, budgeted_strategies
+from .bitboard import Fleet, random_fleet
+from .board import Board
+from .enums import Player, ship_names
+from .renderer import Renderer
+from .simulation import play_ai_game
+from .state import GameState
+
+
+def measure(
+    setup: Callable[[], Any], run: Callable[[Any], int], repeat: int
+) -> dict[str, float]:
+    # setup is untimed and runs before every repeat; run returns how many
+    # operations it performed so timings are reported per operation
+    timings: list[float] = []
+    operations = 0
+    for _ in range(repeat):
+        state = setup()
+        start = perf_counter()
+        operations = run(state)
+        timings.append((perf_counter() - start) / operations)
+    return {
+        "operations": operations,
+        "repeat": repeat,
+        "min_us": min(timings) * 1e6,
+        "median_us": median(timings) * 1e6,
+    }
+
+
+def midgame_boards(
+    count: int, shots: int, factory: Callable[[], GameState] = GameState
+) -> list[GameState]:
+    boards = []
+    for _ in range(count):
+        board = factory()
+        board.place_ai_ships(Player.ONE)
+        board.place_ai_ships(Player.TWO)
+        for coord in sample([(y, x) for y in range(10) for x in range(10)], shots):
+            board.fire(Player.TWO, coord)
+        boards.append(board)
+    return boards
+
+
+def bench_place_ship(size: int) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    def setup() -> list[tuple[GameState, Fleet]]:
+        return [(GameState(), random_fleet()) for _ in range(size)]
+
+    def run(state: list[tuple[GameState, Fleet]]) -> int:
+        for board, fleet in state:
+            board.place_fleet(Player.ONE, fleet)
+        return len(state) * len(ship_names)
+
+    return setup, run
+
+
+def bench_random_fleet(size: int) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    def run(state: None) -> int:
+        for _ in range(size):
+            random_fleet()
+        return size
+
+    return lambda: None, run
+
+
+def bench_change_state(size: int) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    def setup() -> list[tuple[GameState, list[tuple[int, int]]]]:
+        state = []
+        for _ in range(size):
+            board = GameState()
+            board.place_ai_ships(Player.ONE)
+            board.place_ai_ships(Player.TWO)
+            state.append(
+                (board, sample([(y, x) for y in range(10) for x in range(10)], 100))
+            )
+        return state
+
+    def run(state: list[tuple[GameState, list[tuple[int, int]]]]) -> int:
+        for board, coords in state:
+            for coord in coords:
+                board.change_state(Player.ONE, coord)
+        return len(state) * 100
+
+    return setup, run
+
+
+def bench_snapshot(size: int) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    def run(state: list[GameState]) -> int:
+        for board in state:
+            GameState.from_snapshot(board.snapshot())
+        return len(state)
+
+    return lambda: midgame_boards(size, 30), run
+
+
+def bench_ai_guess(
+    strategy: str, size: int
+) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    guess = ai_strategies[strategy]
+
+    def run(state: list[GameState]) -> int:
+        for board in state:
+            guess(board, Player.TWO)
+        return len(state)
+
+    return lambda: midgame_boards(size, 30), run
+
+
+def bench_game(
+    strategy: str, size: int
+) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    def run(state: None) -> int:
+        for _ in range(size):
+            play_ai_game(None, strategy, strategy)
+        return size
+
+    return lambda: None, run
+
+
+def bench_display(size: int) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    def run(state: list[Board]) -> int:
+        with redirect_stdout(io.StringIO()):
+            for board in state:
+                board.display(Player.ONE)
+                board.display(Player.ONE, [(0, 0)], guess=True)
+        return len(state) * 2
+
+    return lambda: midgame_boards(size, 30, Board), run
+
+
+def bench_render(size: int) -> tuple[Callable[[], Any], Callable[[Any], int]]:
+    # one cursor step per frame, drawn through the diffing renderer
+    def setup() -> list[Board]:
+        boards = midgame_boards(size, 30, Board)
+        for board in boards:
+            board.renderer = Renderer(io.StringIO())
+        return boards
+
+    def run(state: list[Board]) -> int:
+        for board in state:
+            for column in range(10):
+                board.renderer.draw(
+                    [
+                        *board.board_rows(Player.ONE),
+                        *board.board_rows(Player.TWO, [(0, column)], guess=True),
+                    ]
+                )
+        return len(state) * 10
+
+    return setup, run
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    random_seed: int = 0, repeat: int = 5, scale: float = 1.0
+) -> dict[str, Any]:
+    def size(base: int) -> int:
+        return max(1, int(base * scale))
+
+    benchmarks: dict[str, tuple[Callable[[], Any], Callable[[Any], int]]] = {
+        "place_ship": bench_place_ship(size(200)),
+        "random_fleet": bench_random_fleet(size(200)),
+        "change_state": bench_change_state(size(50)),
+        "snapshot": bench_snapshot(size(200)),
+        "display": bench_display(size(50)),
+        "render": bench_render(size(20)),
+    }
+    # budgeted strategies take their whole budget on most moves, so they get
+    # a tenth of the guesses and no full games
+    for strategy in ai_strategies:
+        guesses = size(10 if strategy in budgeted_strategies else 100)
+        benchmarks[f"ai_guess[{strategy}]"] = bench_ai_guess(strategy, guesses)
+    for strategy in ai_strategies:
+        if strategy not in budgeted_strategies:
+            benchmarks[f"game[{strategy}]"] = bench_game(strategy, size(10))
+
+    results = {}
+    for name, (setup, run) in benchmarks.items():
+        # reseed per benchmark so each one is reproducible on its own
+        seed(random_seed)
+        results[name] = measure(setup, run, repeat)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": random_seed,
+            "repeat": repeat,
+            "scale": scale,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    for name, result in results["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            result["baseline_median_us"] = baseline["benchmarks"][name]["median_us"]
+            result["ratio"] = result["median_us"] / result["baseline_median_us"]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = ArgumentParser(description="Time board operations and AI moves")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiply the work per benchmark"
+    )
+    parser.add_argument("--baseline", help="earlier JSON output to compare against")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.seed, args.repeat, args.scale)
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(results, json.load(file))
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+from random import choice
+from typing import Iterator, NamedTuple
+
+from .enums import Direction, ShipState, ship_names
+
+
+def bit(x: int, y: int, width: int = 10) -> int:
+    return 1 << (y * width + x)
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def mask_coords(mask: int, width: int = 10) -> list[tuple[int, int]]:
+    return [(i % width, i // width) for i in iter_bits(mask)]
+
+
+class Placement(NamedTuple):
+    mask: int
+    x: int
+    y: int
+    direction: Direction
+
+
+def build_placements(length: int, width: int = 10, height: int = 10) -> list[Placement]:
+    placements = []
+    # a single cell reads the same either way, so it is only placed once
+    for direction in (Direction.HORIZONTAL,) if length == 1 else Direction:
+        for y in range(height - (length - 1) * direction.value):
+            for x in range(width - (length - 1) * (1 - direction.value)):
+                mask = 0
+                for i in range(length):
+                    if direction == Direction.HORIZONTAL:
+                        mask |= bit(x + i, y, width)
+                    else:
+                        mask |= bit(x, y + i, width)
+                placements.append(Placement(mask, x, y, direction))
+    return placements
+
+
+class GameConfig:
+    # board dimensions and fleet (ship name -> length, in placement order),
+    # with every table that depends on them built once per config
+    def __init__(
+        self, width: int = 10, height: int = 10, fleet: dict[str, int] | None = None
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.fleet: dict[str, int] = (
+            dict(fleet)
+            if fleet is not None
+            else {ship: value.value for ship, value in ship_names.items()}
+        )
+        if width < 1 or height < 1:
+            raise ValueError(f"The board must be at least 1x1, not {width}x{height}")
+        if not self.fleet:
+            raise ValueError("The fleet needs at least one ship")
+        for ship, length in self.fleet.items():
+            if length < 1:
+                raise ValueError(f"The {ship} must be at least 1 long, not {length}")
+            if length > max(width, height):
+                raise ValueError(
+                    f"The {ship} ({length} long) does not fit a {width}x{height} board"
+                )
+        if sum(self.fleet.values()) > self.cells:
+            raise ValueError(
+                f"The fleet covers {sum(self.fleet.values())} cells, more than "
+                f"the {self.cells} of a {width}x{height} board"
+            )
+
+        # every legal placement of every ship on an empty board, shared by
+        # ships of the same length
+        self.placement_lengths: dict[int, list[Placement]] = {
+            length: build_placements(length, width, height)
+            for length in sorted(set(self.fleet.values()))
+        }
+        self.placements: dict[str, list[Placement]] = {
+            ship: self.placement_lengths[length] for ship, length in self.fleet.items()
+        }
+        self.placement_index: dict[tuple[str, int, int, Direction], Placement] = {
+            (ship, placement.x, placement.y, placement.direction): placement
+            for ship, ship_placements in self.placements.items()
+            for placement in ship_placements
+        }
+        # single cells are placed horizontally, but may be asked for either way
+        for ship, length in self.fleet.items():
+            if length == 1:
+                for placement in self.placements[ship]:
+                    self.placement_index[
+                        (ship, placement.x, placement.y, Direction.VERTICAL)
+                    ] = placement
+
+    def __repr__(self) -> str:
+        return f"GameConfig({self.width}, {self.height}, {self.fleet})"
+
+
+standard = GameConfig()
+placement_lengths = standard.placement_lengths
+placements = standard.placements
+placement_index = standard.placement_index
+
+# position of each placement in its length's table, e.g. for compact records
+placement_numbers: dict[Placement, int] = {
+    placement: number
+    for length_placements in placement_lengths.values()
+    for number, placement in enumerate(length_placements)
+}
+
+# one placement per ship, in fleet order
+Fleet = tuple[Placement, ...]
+
+
+def random_fleet(config: GameConfig = standard, attempts: int = 1000) -> Fleet:
+    # each ship is placed uniformly among the placements that avoid the ships
+    # before it; guessing and checking first keeps this cheap on big boards.
+    # A crowded fleet can leave a ship nowhere to go, which starts over
+    for _ in range(attempts):
+        occupied = 0
+        fleet = []
+        for ship in config.fleet:
+            ship_placements = config.placements[ship]
+            for _ in range(8):
+                placement = choice(ship_placements)
+                if not placement.mask & occupied:
+                    break
+            else:
+                free = [
+                    placement
+                    for placement in ship_placements
+                    if not placement.mask & occupied
+                ]
+                if not free:
+                    break
+                placement = choice(free)
+            occupied |= placement.mask
+            fleet.append(placement)
+        else:
+            return tuple(fleet)
+    raise ValueError(f"Could not place the fleet of {config} in {attempts} attempts")
+
+
+class BitBoard:
+    # each field is a mask with one bit per cell, indexed by y * width + x;
+    # sunk cells are also hits
+    __slots__ = ("ships", "hits", "misses", "sunk")
+
+    def __init__(self) -> None:
+        self.ships: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.sunk: int = 0
+
+    def copy(self) -> "BitBoard":
+        bits = BitBoard.__new__(BitBoard)
+        bits.ships = self.ships
+        bits.hits = self.hits
+        bits.misses = self.misses
+        bits.sunk = self.sunk
+        return bits
+
+    @property
+    def guessed(self) -> int:
+        return self.hits | self.misses
+
+    def state(self, x: int, y: int, width: int = 10) -> int:
+        cell = bit(x, y, width)
+        if self.sunk & cell:
+            return ShipState.SUNK.value
+        if self.hits & cell:
+            return ShipState.HIT.value
+        if self.misses & cell:
+            return ShipState.WRONG_GUESS.value
+        if self.ships & cell:
+            return ShipState.INTACT.value
+        return ShipState.EMPTY.value
+
+    def grid(self, width: int = 10, height: int = 10) -> list[list[int]]:
+        # read-only compatibility view in the old list[list[int]] layout; later
+        # masks overwrite earlier ones, matching the precedence in state()
+        cells = [ShipState.EMPTY.value] * (width * height)
+        for mask, state in (
+            (self.ships, ShipState.INTACT),
+            (self.misses, ShipState.WRONG_GUESS),
+            (self.hits, ShipState.HIT),
+            (self.sunk, ShipState.SUNK),
+        ):
+            for index in iter_bits(mask):
+                cells[index] = state.value
+        return [cells[y * width : y * width + width] for y in range(height)]
@@ -0,0 +1,349 @@
+import sys
+from time import time
+from typing import TYPE_CHECKING
+
+from .bitboard import GameConfig, standard
+from .enums import Direction, GameType, Player, ShipState
+from .errors import InvalidGuessError, InvalidShipPlacementError
+from .renderer import Frame, Renderer, glyphs, row_labels
+from .state import GameState
+from .ui import Color, clear, cprint, ctext, run_gracefully
+
+if TYPE_CHECKING:
+    from .keys import TerminalKeys
+
+
+class Board(GameState):
+    def __init__(
+        self, ai_strategy: str = "heuristic", config: GameConfig = standard
+    ) -> None:
+        super().__init__(ai_strategy, config)
+
+        self.player1_last_shot: tuple[int, int] = (0, 0)
+        self.player2_last_shot: tuple[int, int] = (0, 0)
+
+        self.renderer = Renderer()
+        self.terminal_keys: TerminalKeys | None = None
+        self.key_cooldown: dict[str, float] = {}
+        # keys read in the same batch after an Enter, for the next prompt
+        self.held_keys: list[str] = []
+        self.update: ShipState | None = None
+        self.last_placed_ship: tuple[Direction, tuple[int, int]] = (
+            Direction.HORIZONTAL,
+            (0, 0),
+        )
+
+    def board_rows(
+        self,
+        player: Player,
+        coord_range: list[tuple[int, int]] | None = None,
+        guess: bool = False,
+    ) -> Frame:
+        if guess:
+            title = f"Player {1 if player.value == 2 else 2}'s guesses:"
+        else:
+            title = f"Player {player.value}'s board:"
+        highlighted = set(coord_range or ())
+        rows: Frame = [
+            (title,),
+            (
+                ctext(
+                    "  " + " ".join(str(j % 10) for j in range(self.config.width)),
+                    fg=Color.FG.lightblue,
+                ),
+            ),
+        ]
+        for i, row in enumerate(getattr(self, f"player{player.value}")):
+            rows.append(
+                (
+                    row_labels[i % len(row_labels)],
+                    *(
+                        glyphs[(guess, col, (i, j) in highlighted)]
+                        for j, col in enumerate(row)
+                    ),
+                )
+            )
+        return rows
+
+    def display(
+        self,
+        player: Player,
+        coord_range: list[tuple[int, int]] | None = None,
+        guess: bool = False,
+    ) -> None:
+        print(
+            "\n".join(
+                "".join(row) for row in self.board_rows(player, coord_range, guess)
+            )
+        )
+
+    def get_key(self, cooldown_duration: float = 0.2) -> str:
+        # keyboard needs root or an input device on Linux, so only the
+        # interactive game pays for importing it
+        from keyboard import read_key
+
+        while True:
+            key = read_key()
+            if isinstance(key, str):
+                key = key.lower()
+            if key not in ("w", "a", "s", "d", "enter", "v", "h"):
+                continue
+            current_time = time()
+            if (
+                key not in self.key_cooldown
+                or (current_time - self.key_cooldown[key]) > cooldown_duration
+            ):
+                self.key_cooldown[key] = current_time
+                return key
+
+    def get_keys(self) -> list[str]:
+        # every key pressed since the last frame, applied before the next redraw
+        if self.held_keys:
+            keys, self.held_keys = self.held_keys, []
+            return keys
+        if self.terminal_keys is not None:
+            return self.terminal_keys.read_batch()
+        return [self.get_key()]
+
+    def place_player_ships(self, player: Player) -> None:
+        direction = Direction.HORIZONTAL
+
+        width = self.config.width
+        height = self.config.height
+
+        def min_max_x_y(direction: Direction, length: int) -> tuple[int, int, int, int]:
+            min_x = 0
+            max_x = width - length if direction == Direction.HORIZONTAL else width - 1
+            min_y = 0
+            max_y = height - length if direction == Direction.VERTICAL else height - 1
+            return min_x, max_x, min_y, max_y
+
+        for ship, length in self.config.fleet.items():
+            direction, leftmost = self.last_placed_ship
+            min_x, max_x, min_y, max_y = min_max_x_y(direction, length)
+            placed = False
+            message = ""
+            while not placed:
+                frame: Frame = [
+                    (ctext("Welcome to Battleship!", fg=Color.FG.yellow),),
+                    (f"Player {int(player.value)}, place your ships:",),
+                    (f"Place your {ship} ({length} spaces)",),
+                    *self.board_rows(
+                        player,
+                        [(leftmost[0], leftmost[1] + i) for i in range(length)]
+                        if direction == Direction.HORIZONTAL
+                        else [(leftmost[0] + i, leftmost[1]) for i in range(length)],
+                    ),
+                ]
+                if message:
+                    frame.append((message,))
+                self.renderer.draw(frame)
+                message = ""
+                keys = self.get_keys()
+                for index, key in enumerate(keys):
+                    match key:
+                        case "v":
+                            direction = Direction.VERTICAL
+                            min_x, max_x, min_y, max_y = min_max_x_y(direction, length)
+                            leftmost = (
+                                min(max_y, leftmost[0]),
+                                min(max_x, leftmost[1]),
+                            )
+                        case "h":
+                            direction = Direction.HORIZONTAL
+                            min_x, max_x, min_y, max_y = min_max_x_y(direction, length)
+                            leftmost = (
+                                min(max_y, leftmost[0]),
+                                min(max_x, leftmost[1]),
+                            )
+                        case "w":
+                            leftmost = (max(min_y, leftmost[0] - 1), leftmost[1])
+                        case "a":
+                            leftmost = (leftmost[0], max(min_x, leftmost[1] - 1))
+                        case "s":
+                            leftmost = (min(max_y, leftmost[0] + 1), leftmost[1])
+                        case "d":
+                            leftmost = (leftmost[0], min(max_x, leftmost[1] + 1))
+                        case "enter":
+                            try:
+                                self.place_ship(
+                                    player,
+                                    ship,
+                                    leftmost[1],
+                                    leftmost[0],
+                                    direction,
+                                )
+                                placed = True
+                            except InvalidShipPlacementError as e:
+                                message = str(e)
+                            self.held_keys = keys[index + 1 :]
+                            break
+                self.last_placed_ship = (direction, leftmost)
+        self.last_placed_ship = (Direction.HORIZONTAL, (0, 0))
+
+    def place_player_guess(self, player: Player, pvp: bool = False) -> None:
+        coord: tuple[int, int] = getattr(self, f"player{player.value}_last_shot")
+        placed = False
+        message = ""
+        while not placed:
+            frame: Frame = [(ctext("Welcome to Battleship!", fg=Color.FG.yellow),)]
+            if not pvp:
+                frame.append(("Your board:",))
+                frame.extend(self.board_rows(player))
+            else:
+                frame.append(("Previous board:",))
+                frame.extend(self.board_rows(player, guess=True))
+            frame.append((f"Player {player.value}, place your guess:",))
+            frame.extend(
+                self.board_rows(
+                    Player.TWO if player == Player.ONE else Player.ONE,
+                    [coord],
+                    guess=True,
+                )
+            )
+            if self.update:
+                if pvp:
+                    other_player = Player.TWO if player == Player.ONE else Player.ONE
+                else:
+                    other_player = player
+                if self.update == ShipState.SUNK:
+                    frame.append(
+                        (
+                            f"Player {other_player.value} {Color.FG.red}sunk{Color.reset} a ship!",
+                        )
+                    )
+                elif self.update == ShipState.HIT:
+                    frame.append(
+                        (
+                            f"Player {other_player.value} {Color.FG.lightred}hit{Color.reset} a ship!",
+                        )
+                    )
+                elif self.update == ShipState.WRONG_GUESS:
+                    frame.append(
+                        (
+                            f"Player {other_player.value} {Color.FG.cyan}missed{Color.reset}!",
+                        )
+                    )
+            if message:
+                frame.append((message,))
+            self.renderer.draw(frame)
+            message = ""
+            keys = self.get_keys()
+            for index, key in enumerate(keys):
+                match key:
+                    case "w":
+                        coord = (max(0, coord[0] - 1), coord[1])
+                    case "a":
+                        coord = (coord[0], max(0, coord[1] - 1))
+                    case "s":
+                        coord = (min(self.config.height - 1, coord[0] + 1), coord[1])
+                    case "d":
+                        coord = (coord[0], min(self.config.width - 1, coord[1] + 1))
+                    case "enter":
+                        try:
+                            self.update = self.fire(player, coord)
+
+                            if player == Player.ONE:
+                                self.player1_last_shot = coord
+                            elif player == Player.TWO:
+                                self.player2_last_shot = coord
+
+                            placed = True
+                        except InvalidGuessError as e:
+                            message = str(e)
+                        self.held_keys = keys[index + 1 :]
+                        break
+
+    @run_gracefully
+    def main(self) -> None:
+        # the AIs (numpy), the fleet library and the terminal event loop are
+        # only needed once a game is played, so importing Board stays cheap
+        from .ai import ai_strategies
+        from .fleets import FleetLibrary
+        from .keys import TerminalKeys
+
+        clear()
+        cprint("Welcome to Battleship!", fg=Color.FG.yellow)
+        while True:
+            try:
+                game_type = input("Enter 1 for PvP, 2 for PvAI: ")
+                if game_type not in ("1", "2"):
+                    raise ValueError
+                if game_type == "1":
+                    game_type = GameType.PVP
+                elif game_type == "2":
+                    game_type = GameType.PVAI
+                break
+            except ValueError:
+                print("Invalid input")
+                continue
+
+        if game_type == GameType.PVAI:
+            while True:
+                try:
+                    ai_strategy = input(
+                        f"Choose an AI ({', '.join(ai_strategies)}): "
+                    ).lower()
+                    if ai_strategy not in ai_strategies:
+                        raise ValueError
+                    self.ai_strategy = ai_strategy
+                    break
+                except ValueError:
+                    print("Invalid input")
+                    continue
+
+        self.key_cooldown["enter"] = time()
+
+        if TerminalKeys.supported():
+            self.terminal_keys = TerminalKeys(sys.stdin.fileno())
+            self.terminal_keys.open()
+        try:
+            if game_type == GameType.PVP:
+                self.place_player_ships(Player.ONE)
+                self.place_player_ships(Player.TWO)
+                player = Player.ONE
+                while not self.game_ended:
+                    self.place_player_guess(player, pvp=True)
+                    player = Player.TWO if player == Player.ONE else Player.ONE
+            elif game_type == GameType.PVAI:
+                self.place_player_ships(Player.ONE)
+                self.place_ai_ships(library=FleetLibrary.load())
+                player = Player.ONE
+                while not self.game_ended:
+                    if player == Player.ONE:
+                        self.place_player_guess(player)
+                    else:
+                        self.place_ai_guess()
+                    player = Player.TWO if player == Player.ONE else Player.ONE
+        finally:
+            if self.terminal_keys is not None:
+                self.terminal_keys.close()
+                self.terminal_keys = None
+
+        self.renderer.reset()
+        clear()
+        cprint("Welcome to Battleship!", fg=Color.FG.yellow)
+        player = Player.ONE if player == Player.TWO else Player.TWO
+        self.display(player)
+        self.display(Player.TWO if player == Player.ONE else Player.ONE)
+        cprint(
+            f"Player {player.value}{(' (human)' if player == Player.ONE else ' (AI)') if game_type == GameType.PVAI else ''} won!",
+            fg=Color.FG.yellow,
+        )
+
+        cprint("Shots fired:", fg=Color.FG.lightblue)
+        print(
+            f"Player 1{' (human)' if game_type == GameType.PVAI else ''}: {self.player1_shots}"
+        )
+        print(
+            f"Player 2{' (AI)' if game_type == GameType.PVAI else ''}: {self.player2_shots}"
+        )
+
+        cprint("Accuracy:", fg=Color.FG.lightblue)
+        print(
+            f"Player 1{' (human)' if game_type == GameType.PVAI else ''}: {self.accuracy(Player.ONE) * 100:.1f}%"
+        )
+        print(
+            f"Player 2{' (AI)' if game_type == GameType.PVAI else ''}: {self.accuracy(Player.TWO) * 100:.1f}%"
+        )
+        raise KeyboardInterrupt
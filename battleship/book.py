@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import dbm
+import os
+from argparse import ArgumentParser
+from collections import OrderedDict
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable
+
+from .bitboard import BitBoard
+from .enums import Player
+from .layouts import CACHE_DIR
+from .symmetry import canonical_masks, inverse_symmetries, symmetries
+
+if TYPE_CHECKING:
+    from .state import GameState
+
+Guess = Callable[["GameState", Player], tuple[int, int]]
+
+# where `python -m battleship book` writes the book the "book" AI reads
+BOOK_PATH = os.path.join(CACHE_DIR, "book")
+
+
+class OpeningBook:
+    # looks up the shot to play in the first `plies` shots of a game instead
+    # of working it out again every game. Positions are keyed on what the
+    # shooter has seen (misses, unsunk hits, sunk cells and the ships still
+    # afloat), which does not depend on the order the shots were fired in,
+    # and reduced over the board's rotations and reflections so symmetric
+    # positions share an entry; shots are stored in that canonical frame.
+    # `evaluate` must pick the same shot every time for a position; later
+    # positions go to `fallback`. Entries are kept in an LRU of `size`
+    # positions and, given a path, in a dbm file that outlives the process,
+    # opened with dbm's `flag`; with "r" the file is only read, and a missing
+    # file leaves the book to the LRU alone
+    def __init__(
+        self,
+        evaluate: Guess,
+        fallback: Guess,
+        plies: int = 8,
+        size: int = 1 << 16,
+        path: str | None = None,
+        flag: str = "c",
+    ) -> None:
+        self.evaluate = evaluate
+        self.fallback = fallback
+        self.plies = plies
+        self.size = size
+        self.path = path
+        self.flag = flag
+        self.store = None
+        self.cache: OrderedDict[bytes, int] = OrderedDict()
+        # lookups answered from the book and positions evaluated afresh
+        self.found = 0
+        self.evaluated = 0
+
+    def key(self, board: GameState, target: Player) -> tuple[bytes, int]:
+        # the position's key and the symmetry that maps it to the key's frame
+        config = board.config
+        bits: BitBoard = getattr(board, f"player{target.value}_bits")
+        ships = getattr(board, f"player{target.value}_ships")
+        size = (config.cells + 7) // 8
+        masks, symmetry = canonical_masks(
+            config, bits.misses, bits.hits & ~bits.sunk, bits.sunk
+        )
+        key = b"".join(
+            (
+                f"{config.width}x{config.height}:".encode(),
+                *(mask.to_bytes(size, "little") for mask in masks),
+                bytes(
+                    length
+                    for ship, length in config.fleet.items()
+                    if not (ship in ships and ships[ship]["sunk"])
+                ),
+            )
+        )
+        return key, symmetry
+
+    def open_store(self) -> dbm._Database | None:
+        if self.store is None and self.path is not None:
+            try:
+                self.store = dbm.open(self.path, self.flag)
+            except dbm.error:
+                # not written yet; no point trying again every lookup
+                self.path = None
+        return self.store
+
+    def lookup(self, key: bytes) -> int | None:
+        cell = self.cache.get(key)
+        if cell is not None:
+            self.cache.move_to_end(key)
+            return cell
+        store = self.open_store()
+        if store is not None and key in store:
+            cell = int.from_bytes(store[key], "little")
+            self.remember(key, cell, False)
+            return cell
+        return None
+
+    def remember(self, key: bytes, cell: int, persist: bool = True) -> None:
+        self.cache[key] = cell
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.size:
+            self.cache.popitem(last=False)
+        store = self.open_store()
+        if persist and store is not None and self.flag != "r":
+            store[key] = cell.to_bytes(4, "little")
+
+    def __call__(self, board: GameState, player: Player) -> tuple[int, int]:
+        target = Player.ONE if player == Player.TWO else Player.TWO
+        bits: BitBoard = getattr(board, f"player{target.value}_bits")
+        if bits.guessed.bit_count() >= self.plies:
+            return self.fallback(board, player)
+
+        config = board.config
+        key, symmetry = self.key(board, target)
+        canonical = self.lookup(key)
+        if canonical is None:
+            self.evaluated += 1
+            row, col = self.evaluate(board, player)
+            cell = row * config.width + col
+            self.remember(key, symmetries(config)[symmetry][cell])
+        else:
+            self.found += 1
+            cell = inverse_symmetries(config)[symmetry][canonical]
+        return divmod(cell, config.width)
+
+    def precompute(self, board: GameState, player: Player = Player.TWO) -> int:
+        # fills the book for every position reachable from `board` by
+        # following it while each shot misses or hits without sinking, and
+        # returns how many positions were added
+        target = Player.ONE if player == Player.TWO else Player.TWO
+        added = 0
+        positions = [board]
+        while positions:
+            position = positions.pop()
+            bits: BitBoard = getattr(position, f"player{target.value}_bits")
+            if bits.guessed.bit_count() >= self.plies:
+                continue
+            config = position.config
+            key, symmetry = self.key(position, target)
+            canonical = self.lookup(key)
+            if canonical is None:
+                row, col = self.evaluate(position, player)
+                cell = row * config.width + col
+                self.remember(key, symmetries(config)[symmetry][cell])
+                added += 1
+            else:
+                cell = inverse_symmetries(config)[symmetry][canonical]
+            for outcome in ("misses", "hits"):
+                branch = position.copy()
+                branch_bits = getattr(branch, f"player{target.value}_bits")
+                setattr(branch_bits, outcome, getattr(branch_bits, outcome) | 1 << cell)
+                positions.append(branch)
+        return added
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+
+def book_main(argv: list[str] | None = None) -> None:
+    # the AIs import this module, so they are only loaded when it is run
+    from .ai import density_guess, opening_guess
+    from .bitboard import standard
+    from .layouts import layout_counts
+    from .state import GameState
+
+    parser = ArgumentParser(
+        description="Precompute the opening book the book AI reads at startup"
+    )
+    parser.add_argument("--plies", type=int, default=8)
+    parser.add_argument("--path", default=BOOK_PATH)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    # opening_guess only reads the layout counts, so they are counted (once
+    # per machine) here, and the book's first shot uses them
+    layout_counts(standard, args.cache_dir)
+
+    def evaluate(board: GameState, player: Player) -> tuple[int, int]:
+        return opening_guess(board, player, args.cache_dir)
+
+    os.makedirs(os.path.dirname(args.path) or ".", exist_ok=True)
+    book = OpeningBook(evaluate, density_guess, args.plies, path=args.path)
+    try:
+        added = book.precompute(GameState())
+    finally:
+        book.close()
+    elapsed = perf_counter() - start
+    print(f"{added} positions added in {elapsed:.1f}s, saved to {args.path}")
@@ -0,0 +1,54 @@
+from enum import Enum
+
+
+class Player(Enum):
+    ONE = 1
+    TWO = 2
+
+
+class Ship(Enum):
+    CARRIER = 5
+    BATTLESHIP = 4
+    CRUISER = 3
+    SUBMARINE = 3
+    DESTROYER = 2
+
+    def __getattribute__(self, __name: str) -> int:
+        if __name == "SUBMARINE":
+            return 3
+        return super().__getattribute__(__name)
+
+
+ship_names: dict[str, Ship] = {
+    "Carrier": Ship.CARRIER,
+    "Battleship": Ship.BATTLESHIP,
+    "Cruiser": Ship.CRUISER,
+    "Submarine": Ship.SUBMARINE,
+    "Destroyer": Ship.DESTROYER,
+}
+
+opp_ship_names: dict[Ship, str] = {
+    Ship.CARRIER: "Carrier",
+    Ship.BATTLESHIP: "Battleship",
+    Ship.CRUISER: "Cruiser",
+    Ship.SUBMARINE: "Submarine",
+    Ship.DESTROYER: "Destroyer",
+}
+
+
+class Direction(Enum):
+    HORIZONTAL = 0
+    VERTICAL = 1
+
+
+class ShipState(Enum):
+    EMPTY = 0
+    INTACT = 1
+    HIT = 2
+    SUNK = 3
+    WRONG_GUESS = 4
+
+
+class GameType(Enum):
+    PVP = 1
+    PVAI = 2
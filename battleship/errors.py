@@ -0,0 +1,10 @@
+class InvalidShipPlacementError(Exception):
+    pass
+
+
+class InvalidGuessError(Exception):
+    pass
+
+
+class ProtocolError(Exception):
+    pass
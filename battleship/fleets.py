@@ -0,0 +1,239 @@
+import json
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import exp
+from random import Random, choice, seed
+
+from .ai import ai_strategies
+from .bitboard import (
+    Fleet,
+    GameConfig,
+    Placement,
+    placement_numbers,
+    placements,
+    random_fleet,
+    standard,
+)
+from .layouts import CACHE_DIR
+from .symmetry import symmetries, transform_mask
+from .tournament import play_solo_game
+
+LIBRARY_PATH = os.path.join(CACHE_DIR, "fleets.json")
+
+
+@lru_cache(maxsize=None)
+def placements_by_mask(config: GameConfig) -> dict[int, Placement]:
+    return {
+        placement.mask: placement
+        for length_placements in config.placement_lengths.values()
+        for placement in length_placements
+    }
+
+
+def transform_fleet(fleet: Fleet, permutation: list[int], config: GameConfig) -> Fleet:
+    by_mask = placements_by_mask(config)
+    return tuple(
+        by_mask[transform_mask(placement.mask, permutation)] for placement in fleet
+    )
+
+
+class FleetLibrary:
+    # strong layouts found by anneal_fleets, with the mean shots the strategy
+    # they were tuned against needed to sink each. draw() picks one at random
+    # under a random rotation or reflection, which keeps its score and makes
+    # the library eight times harder to learn
+    def __init__(
+        self, strategy: str, entries: list[tuple[Fleet, float]] | None = None
+    ) -> None:
+        self.strategy = strategy
+        self.entries = sorted(entries or [], key=lambda entry: -entry[1])
+
+    def add(self, entries: list[tuple[Fleet, float]], size: int) -> None:
+        # keeps the `size` best layouts
+        self.entries = sorted(self.entries + entries, key=lambda entry: -entry[1])
+        del self.entries[size:]
+
+    def draw(self, config: GameConfig = standard) -> Fleet:
+        if not self.entries or config is not standard:
+            return random_fleet(config)
+        fleet, _ = choice(self.entries)
+        return transform_fleet(fleet, choice(symmetries(config)), config)
+
+    def save(self, path: str = LIBRARY_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "w") as file:
+            json.dump(
+                {
+                    "strategy": self.strategy,
+                    "fleets": [
+                        {
+                            "placements": [placement_numbers[p] for p in fleet],
+                            "shots": shots,
+                        }
+                        for fleet, shots in self.entries
+                    ],
+                },
+                file,
+                indent=2,
+            )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str = LIBRARY_PATH) -> "FleetLibrary | None":
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return cls(
+            data["strategy"],
+            [
+                (
+                    tuple(
+                        placements[ship][number]
+                        for ship, number in zip(standard.fleet, entry["placements"])
+                    ),
+                    entry["shots"],
+                )
+                for entry in data["fleets"]
+            ],
+        )
+
+
+def fleet_score(strategy: str, fleet: Fleet, games: int, score_seed: int) -> float:
+    # mean shots the strategy needs to sink the fleet. Every layout is scored
+    # on the same random stream, so two layouts are compared on the same
+    # luck and the difference is mostly down to the layouts
+    seed(score_seed)
+    return sum(play_solo_game(strategy, fleet) for _ in range(games)) / games
+
+
+def neighbour(fleet: Fleet, rng: Random, config: GameConfig = standard) -> Fleet:
+    # the fleet with one ship moved to another free placement
+    index = rng.randrange(len(fleet))
+    occupied = 0
+    for other, placement in enumerate(fleet):
+        if other != index:
+            occupied |= placement.mask
+    options = config.placements[list(config.fleet)[index]]
+    while True:
+        placement = options[rng.randrange(len(options))]
+        if not placement.mask & occupied and placement != fleet[index]:
+            return fleet[:index] + (placement,) + fleet[index + 1 :]
+
+
+def anneal_fleet(
+    strategy: str,
+    steps: int = 200,
+    games: int = 20,
+    temperature: float = 2.0,
+    cooling: float = 0.98,
+    chain_seed: int = 0,
+) -> tuple[Fleet, float]:
+    # simulated annealing over layouts for the most shots `strategy` needs:
+    # moves that lose shots are still taken with chance exp(loss / T), so the
+    # search can climb out of local optima early on and settles as T cools
+    rng = Random(chain_seed)
+    seed(chain_seed)
+    fleet = random_fleet()
+    score = fleet_score(strategy, fleet, games, chain_seed)
+    best, best_score = fleet, score
+    for _ in range(steps):
+        candidate = neighbour(fleet, rng)
+        candidate_score = fleet_score(strategy, candidate, games, chain_seed)
+        if candidate_score >= score or rng.random() < exp(
+            (candidate_score - score) / temperature
+        ):
+            fleet, score = candidate, candidate_score
+            if score > best_score:
+                best, best_score = fleet, score
+        temperature *= cooling
+    return best, best_score
+
+
+def anneal_chain(
+    strategy: str, steps: int, games: int, chain_seed: int
+) -> tuple[Fleet, float]:
+    # anneal_fleet with positional arguments, for executor.map
+    return anneal_fleet(strategy, steps, games, chain_seed=chain_seed)
+
+
+def anneal_fleets(
+    strategy: str,
+    chains: int = 8,
+    steps: int = 200,
+    games: int = 20,
+    workers: int | None = None,
+    random_seed: int = 0,
+) -> list[tuple[Fleet, float]]:
+    # one independent annealing chain per layout wanted, spread over the
+    # cores. Each result is then rescored on fresh games, since a chain's best
+    # score is biased upwards by the luck it was picked for
+    seeds = [random_seed * 1_000_003 + chain for chain in range(chains)]
+    chain_jobs = ([strategy] * chains, [steps] * chains, [games] * chains, seeds)
+    if workers == 1:
+        found = list(map(anneal_chain, *chain_jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            found = list(executor.map(anneal_chain, *chain_jobs))
+    fleets = [fleet for fleet, _ in found]
+    score_jobs = (
+        [strategy] * chains,
+        fleets,
+        [games * 4] * chains,
+        [chain_seed + 1 for chain_seed in seeds],
+    )
+    if workers == 1:
+        scores = list(map(fleet_score, *score_jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scores = list(executor.map(fleet_score, *score_jobs))
+    return list(zip(fleets, scores))
+
+
+def fleets_main(argv: list[str] | None = None) -> None:
+    parser = ArgumentParser(
+        description="Search for fleet layouts a targeting strategy is slow to sink"
+    )
+    parser.add_argument("strategy", nargs="?", default="density")
+    parser.add_argument("--chains", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=32, help="layouts to keep")
+    parser.add_argument("--library", default=LIBRARY_PATH)
+    args = parser.parse_args(argv)
+    if args.strategy not in ai_strategies:
+        parser.error(f"unknown strategy {args.strategy}")
+
+    found = anneal_fleets(
+        args.strategy, args.chains, args.steps, args.games, args.workers, args.seed
+    )
+    library = FleetLibrary.load(args.library)
+    if library is None or library.strategy != args.strategy:
+        library = FleetLibrary(args.strategy)
+    library.add(found, args.size)
+    library.save(args.library)
+
+    # random layouts scored the same way, for comparison
+    seed(args.seed)
+    baseline = [
+        fleet_score(args.strategy, random_fleet(), args.games * 4, args.seed + chain)
+        for chain in range(args.chains)
+    ]
+    print(
+        json.dumps(
+            {
+                "strategy": args.strategy,
+                "found_shots": [shots for _, shots in found],
+                "random_shots": sum(baseline) / len(baseline),
+                "library": args.library,
+                "library_size": len(library.entries),
+            },
+            indent=2,
+        )
+    )
@@ -0,0 +1,255 @@
+import json
+from argparse import ArgumentParser
+from collections import Counter
+from functools import wraps
+from random import seed
+from time import perf_counter_ns
+from typing import Any, Callable
+
+from .ai import ai_strategies
+from .bitboard import Placement
+from .enums import Direction, Player, ShipState
+from .errors import InvalidGuessError, InvalidShipPlacementError
+from .simulation import play_ai_game
+from .state import GameState
+
+
+class Histogram:
+    # latencies bucketed by powers of two nanoseconds, so recording is a
+    # bit_length and a list increment
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        self.buckets[ns.bit_length()] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def clear(self) -> None:
+        self.buckets[:] = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1000 if self.count else 0.0,
+            "max_us": self.max / 1000,
+            # upper bound of each bucket in microseconds -> calls
+            "buckets": {
+                f"{(1 << bucket) / 1000:g}": calls
+                for bucket, calls in enumerate(self.buckets)
+                if calls
+            },
+        }
+
+
+class Instrumentation:
+    # counters and latency histograms for the game's hot paths. Nothing is
+    # measured until enable(), which swaps the GameState methods and AI
+    # strategies for timed wrappers; disable() puts the originals back, so a
+    # disabled run executes exactly the uninstrumented code
+    def __init__(self) -> None:
+        self.counters: Counter[str] = Counter()
+        self.histograms: dict[str, Histogram] = {}
+        self.originals: dict[str, Callable] = {}
+        self.strategies: dict[str, Callable] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.originals)
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def reset(self) -> None:
+        # zeroed in place, as the enabled wrappers hold on to these objects
+        self.counters.clear()
+        for histogram in self.histograms.values():
+            histogram.clear()
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        self.originals = {
+            "place_ship": GameState.place_ship,
+            "add_ship": GameState.add_ship,
+            "change_state": GameState.change_state,
+            "place_ai_guess": GameState.place_ai_guess,
+        }
+        GameState.place_ship = self.wrap_place_ship(GameState.place_ship)
+        GameState.add_ship = self.wrap_add_ship(GameState.add_ship)
+        GameState.change_state = self.wrap_change_state(GameState.change_state)
+        GameState.place_ai_guess = self.wrap_place_ai_guess(GameState.place_ai_guess)
+        self.strategies = dict(ai_strategies)
+        for name, guess in self.strategies.items():
+            ai_strategies[name] = self.wrap_guess(name, guess)
+
+    def disable(self) -> None:
+        for name, method in self.originals.items():
+            setattr(GameState, name, method)
+        ai_strategies.update(self.strategies)
+        self.originals = {}
+        self.strategies = {}
+
+    def __enter__(self) -> "Instrumentation":
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def wrap_place_ship(self, method: Callable) -> Callable:
+        counters = self.counters
+        histogram = self.histogram("place_ship")
+
+        @wraps(method)
+        def place_ship(
+            state: GameState,
+            player: Player,
+            ship: str,
+            x: int,
+            y: int,
+            direction: Direction,
+        ) -> None:
+            start = perf_counter_ns()
+            try:
+                method(state, player, ship, x, y, direction)
+            except InvalidShipPlacementError:
+                counters["exceptions.InvalidShipPlacementError"] += 1
+                raise
+            finally:
+                histogram.record(perf_counter_ns() - start)
+
+        return place_ship
+
+    def wrap_add_ship(self, method: Callable) -> Callable:
+        # add_ship is where both place_ship and place_fleet write the board
+        counters = self.counters
+        histogram = self.histogram("add_ship")
+
+        @wraps(method)
+        def add_ship(
+            state: GameState, player: Player, ship: str, placement: Placement
+        ) -> None:
+            start = perf_counter_ns()
+            method(state, player, ship, placement)
+            histogram.record(perf_counter_ns() - start)
+            # one cell written per ship segment
+            counters["add_ship.cells"] += state.config.fleet[ship]
+
+        return add_ship
+
+    def wrap_change_state(self, method: Callable) -> Callable:
+        counters = self.counters
+        histogram = self.histogram("change_state")
+
+        @wraps(method)
+        def change_state(
+            state: GameState, player: Player, coord: tuple[int, int]
+        ) -> ShipState | None:
+            start = perf_counter_ns()
+            try:
+                update = method(state, player, coord)
+            except InvalidGuessError:
+                counters["exceptions.InvalidGuessError"] += 1
+                raise
+            finally:
+                histogram.record(perf_counter_ns() - start)
+            # the shot cell, plus the whole ship when it sinks
+            counters["change_state.cells"] += 1
+            if update is None or update == ShipState.SUNK:
+                bits = getattr(state, f"player{player.value}_ship_bits")
+                ship = getattr(state, f"player{player.value}_cells")[
+                    coord[0] * state.config.width + coord[1]
+                ]
+                counters["change_state.cells"] += bits[ship].bit_count()
+            return update
+
+        return change_state
+
+    def wrap_place_ai_guess(self, method: Callable) -> Callable:
+        counters = self.counters
+
+        @wraps(method)
+        def place_ai_guess(
+            state: GameState, player: Player = Player.TWO, strategy: str | None = None
+        ) -> None:
+            guesses = counters["ai_guess.calls"]
+            method(state, player, strategy)
+            counters["place_ai_guess.calls"] += 1
+            # every guess after the first was a retry of a rejected shot
+            counters["place_ai_guess.retries"] += (
+                counters["ai_guess.calls"] - guesses - 1
+            )
+
+        return place_ai_guess
+
+    def wrap_guess(self, name: str, guess: Callable) -> Callable:
+        counters = self.counters
+        histogram = self.histogram(f"ai_guess[{name}]")
+
+        def timed_guess(state: GameState, player: Player) -> tuple[int, int]:
+            start = perf_counter_ns()
+            coord = guess(state, player)
+            histogram.record(perf_counter_ns() - start)
+            counters["ai_guess.calls"] += 1
+            return coord
+
+        return timed_guess
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "latency": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms.items())
+                if histogram.count
+            },
+        }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+instrumentation = Instrumentation()
+
+
+def profile_main(argv: list[str] | None = None) -> None:
+    parser = ArgumentParser(description="Play AI games with hot-path instrumentation")
+    parser.add_argument(
+        "strategies", nargs="*", help=f"one or two of {', '.join(ai_strategies)}"
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if len(args.strategies) > 2:
+        parser.error("at most two strategies")
+    for strategy in args.strategies:
+        if strategy not in ai_strategies:
+            parser.error(f"unknown strategy {strategy}")
+    player1_strategy, player2_strategy = (args.strategies + [None, None])[:2]
+
+    seed(args.seed)
+    instrumentation.reset()
+    with instrumentation:
+        for _ in range(args.games):
+            play_ai_game(None, player1_strategy, player2_strategy or player1_strategy)
+
+    if args.output:
+        instrumentation.dump(args.output)
+    else:
+        print(json.dumps(instrumentation.to_dict(), indent=2))
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import sys
+
+try:
+    import termios
+    import tty
+except ImportError:  # no termios on Windows, Board falls back to keyboard
+    termios = None
+
+KEYS = ("w", "a", "s", "d", "enter", "v", "h")
+
+# escape sequences that map to game keys: arrows in normal (CSI) and
+# application cursor (SS3) mode; every other escape sequence is dropped whole
+KEY_SEQUENCES: dict[bytes, str] = {
+    b"\x1b[A": "w",
+    b"\x1b[B": "s",
+    b"\x1b[C": "d",
+    b"\x1b[D": "a",
+    b"\x1bOA": "w",
+    b"\x1bOB": "s",
+    b"\x1bOC": "d",
+    b"\x1bOD": "a",
+}
+
+
+def sequence_end(data: bytes, start: int) -> int | None:
+    # end of the escape sequence starting at data[start], or None if data
+    # stops before it does. CSI is ESC [, then parameter and intermediate
+    # bytes (0x20-0x3F), then a final byte; SS3 is ESC O and one byte; ESC
+    # before anything else stands alone
+    if start + 1 == len(data):
+        return None
+    introducer = data[start + 1]
+    if introducer == ord("O"):
+        return start + 3 if start + 2 < len(data) else None
+    if introducer != ord("["):
+        return start + 1
+    end = start + 2
+    while end < len(data) and 0x20 <= data[end] <= 0x3F:
+        end += 1
+    return end + 1 if end < len(data) else None
+
+
+def parse_keys(data: bytes) -> tuple[list[str], bytes]:
+    # the game keys in data, and any escape sequence cut off at the end,
+    # which should be put in front of the next read
+    keys = []
+    i = 0
+    while i < len(data):
+        if data[i] == 0x1B:
+            end = sequence_end(data, i)
+            if end is None:
+                return keys, data[i:]
+            key = KEY_SEQUENCES.get(data[i:end])
+            if key is not None:
+                keys.append(key)
+            i = end
+            continue
+        key = chr(data[i]).lower()
+        if key in ("\r", "\n"):
+            keys.append("enter")
+        elif key in KEYS:
+            keys.append(key)
+        i += 1
+    return keys, b""
+
+
+class TerminalKeys:
+    # reads raw bytes from a terminal through the event loop instead of
+    # polling, and hands keys out in batches of at most one per frame
+    def __init__(self, fd: int, frame_interval: float = 1 / 60) -> None:
+        self.fd = fd
+        self.frame_interval = frame_interval
+        self.loop = asyncio.new_event_loop()
+        self.pending: list[str] = []
+        # the start of an escape sequence split across reads
+        self.partial = b""
+        self.ready = asyncio.Event()
+        self.attributes: list | None = None
+
+    @staticmethod
+    def supported() -> bool:
+        return termios is not None and sys.stdin.isatty()
+
+    def open(self) -> None:
+        # cbreak rather than raw so Ctrl+C still raises KeyboardInterrupt
+        self.attributes = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        self.loop.add_reader(self.fd, self.on_readable)
+
+    def close(self) -> None:
+        self.loop.remove_reader(self.fd)
+        if self.attributes is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.attributes)
+            self.attributes = None
+        self.loop.close()
+
+    def on_readable(self) -> None:
+        keys, self.partial = parse_keys(self.partial + os.read(self.fd, 1024))
+        self.pending.extend(keys)
+        if self.pending:
+            self.ready.set()
+
+    async def next_batch(self) -> list[str]:
+        await self.ready.wait()
+        # let a held key's repeats pile up for one frame so they are applied
+        # as a single update and a single redraw
+        await asyncio.sleep(self.frame_interval)
+        keys, self.pending = self.pending, []
+        self.ready.clear()
+        return keys
+
+    def read_batch(self) -> list[str]:
+        return self.loop.run_until_complete(self.next_batch())
@@ -0,0 +1,166 @@
+import os
+from argparse import ArgumentParser
+from functools import lru_cache
+from time import perf_counter
+
+import numpy as np
+
+from .bitboard import GameConfig, Placement, iter_bits, standard
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "battleship")
+# occupied masks handled per matrix product in count_layouts
+CHUNK_SIZE = 4096
+
+
+def mask_words(masks: list[int], words: int) -> np.ndarray:
+    # each mask as `words` little-endian uint64s, so many masks can be tested
+    # against each other at once
+    return np.array(
+        [
+            [mask >> (64 * word) & 0xFFFFFFFFFFFFFFFF for word in range(words)]
+            for mask in masks
+        ],
+        dtype=np.uint64,
+    ).reshape(len(masks), words)
+
+
+def word_cells(masks: np.ndarray, cells: int) -> np.ndarray:
+    return np.unpackbits(masks.astype("<u8").view(np.uint8), axis=1, bitorder="little")[
+        :, :cells
+    ]
+
+
+def placement_cells(placements: list[Placement], cells: int) -> np.ndarray:
+    matrix = np.zeros((len(placements), cells), dtype=np.float32)
+    for row, placement in enumerate(placements):
+        matrix[row, list(iter_bits(placement.mask))] = 1
+    return matrix
+
+
+def occupied_masks(
+    config: GameConfig, ships: list[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    # every distinct union of non-overlapping placements of the given ships,
+    # with how many ways there are to reach it; layouts that cover the same
+    # cells are merged after each ship, so later ships extend each union once
+    words = (config.cells + 63) // 64
+    masks = np.zeros((1, words), dtype=np.uint64)
+    ways = np.ones(1, dtype=np.int64)
+    for ship in ships:
+        placed_masks = []
+        placed_ways = []
+        for placement in mask_words(
+            [placement.mask for placement in config.placements[ship]], words
+        ):
+            free = ~(masks & placement).any(axis=1)
+            placed_masks.append(masks[free] | placement)
+            placed_ways.append(ways[free])
+        masks, inverse = np.unique(
+            np.concatenate(placed_masks), axis=0, return_inverse=True
+        )
+        ways = np.bincount(
+            inverse.ravel(), weights=np.concatenate(placed_ways), minlength=len(masks)
+        ).astype(np.int64)
+    return masks, ways
+
+
+def count_layouts(config: GameConfig = standard) -> tuple[int, np.ndarray]:
+    # exact number of fleet layouts (no two ships overlapping) and how many of
+    # them cover each cell. All ships but the two with the most placements are
+    # enumerated as occupied masks; the last two are closed per mask with
+    # matrix products over their placements instead of being enumerated
+    if len(config.fleet) < 2:
+        raise ValueError("Layout counting needs at least two ships")
+    *ships, first, second = sorted(
+        config.fleet, key=lambda ship: len(config.placements[ship])
+    )
+    masks, ways = occupied_masks(config, ships)
+    first_cells = placement_cells(config.placements[first], config.cells)
+    second_cells = placement_cells(config.placements[second], config.cells)
+    disjoint = (first_cells @ second_cells.T == 0).astype(np.float32)
+
+    total = 0
+    counts = np.zeros(config.cells, dtype=np.int64)
+    for start in range(0, len(masks), CHUNK_SIZE):
+        chunk = masks[start : start + CHUNK_SIZE]
+        chunk_ways = ways[start : start + CHUNK_SIZE]
+        chunk_cells = word_cells(chunk, config.cells).astype(np.float32)
+        first_free = (chunk_cells @ first_cells.T == 0).astype(np.float32)
+        second_free = (chunk_cells @ second_cells.T == 0).astype(np.float32)
+        # for each mask, how many layouts put each ship on each placement
+        second_pairs = (first_free @ disjoint) * second_free
+        first_pairs = (second_free @ disjoint.T) * first_free
+        layouts = second_pairs.sum(axis=1)
+        covered = (
+            first_pairs @ first_cells
+            + second_pairs @ second_cells
+            + layouts[:, None] * chunk_cells
+        )
+        # each sum above is of at most placements^2 ones, far inside the
+        # integers a float32 holds exactly
+        total += int(chunk_ways @ np.rint(layouts).astype(np.int64))
+        counts += chunk_ways @ np.rint(covered).astype(np.int64)
+    return total, counts.reshape(config.height, config.width)
+
+
+def cache_path(config: GameConfig, cache_dir: str) -> str:
+    # ship names do not change the counts, only the board and the lengths
+    lengths = "-".join(str(length) for length in sorted(config.fleet.values()))
+    return os.path.join(
+        cache_dir, f"layouts-{config.width}x{config.height}-{lengths}.npy"
+    )
+
+
+def cached_layout_counts(
+    config: GameConfig = standard, cache_dir: str = CACHE_DIR
+) -> np.ndarray | None:
+    # per-cell layout counts if they are on disk, None rather than counting
+    try:
+        return np.load(cache_path(config, cache_dir))
+    except (OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def layout_counts(
+    config: GameConfig = standard, cache_dir: str = CACHE_DIR
+) -> np.ndarray:
+    # per-cell layout counts from the disk cache, counted and saved on a miss;
+    # a cache that cannot be written only costs recounting next time
+    counts = cached_layout_counts(config, cache_dir)
+    if counts is not None:
+        return counts
+    path = cache_path(config, cache_dir)
+    _, counts = count_layouts(config)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as file:
+            np.save(file, counts)
+        os.replace(partial, path)
+    except OSError:
+        pass
+    return counts
+
+
+def occupancy(config: GameConfig = standard, cache_dir: str = CACHE_DIR) -> np.ndarray:
+    # chance of each cell holding a ship, over all layouts equally likely;
+    # every layout covers sum(lengths) cells, which recovers the total
+    counts = layout_counts(config, cache_dir)
+    return counts / (counts.sum() // sum(config.fleet.values()))
+
+
+def layouts_main(argv: list[str] | None = None) -> None:
+    parser = ArgumentParser(
+        description="Count every fleet layout and cache per-cell occupancy"
+    )
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    counts = layout_counts(standard, args.cache_dir)
+    layouts = counts.sum() // sum(standard.fleet.values())
+    elapsed = perf_counter() - start
+    print(f"{layouts} layouts in {elapsed:.1f}s, cached in {args.cache_dir}")
+    for row in occupancy(standard, args.cache_dir):
+        print(" ".join(f"{chance:.3f}" for chance in row))
@@ -0,0 +1,153 @@
+import mmap
+from itertools import zip_longest
+from random import seed
+from typing import BinaryIO, Iterator, NamedTuple
+
+from .bitboard import Fleet, placement_numbers, placements, standard
+from .enums import Player, ship_names
+from .simulation import play_ai_game
+from .state import GameState
+
+# A record file is MAGIC followed by back-to-back records of
+#   u8  number of shots
+#   5 * u8  player one's fleet, each ship's index into placements[ship]
+#   5 * u8  player two's fleet
+#   u8 per shot: the cell (row * 10 + col), with PLAYER_TWO_SHOT set when
+#       player two fired
+# A game ends after at most 199 shots, so every field fits a byte and a
+# typical game takes well under 100 bytes.
+
+MAGIC = b"BSGR\x01"
+PLAYER_TWO_SHOT = 0x80
+FLEET_SIZE = len(ship_names)
+HEADER_SIZE = 1 + 2 * FLEET_SIZE
+
+
+class GameRecord(NamedTuple):
+    player1_fleet: Fleet
+    player2_fleet: Fleet
+    shots: bytes
+
+    def replay(self) -> GameState:
+        board = GameState()
+        board.place_fleet(Player.ONE, self.player1_fleet)
+        board.place_fleet(Player.TWO, self.player2_fleet)
+        for shot in self.shots:
+            player = Player.TWO if shot & PLAYER_TWO_SHOT else Player.ONE
+            board.fire(player, divmod(shot & ~PLAYER_TWO_SHOT, 10))
+        return board
+
+
+def encode_fleet(fleet: Fleet) -> bytes:
+    return bytes(placement_numbers[placement] for placement in fleet)
+
+
+def decode_fleet(data: bytes) -> Fleet:
+    return tuple(placements[ship][number] for ship, number in zip(ship_names, data))
+
+
+def encode_record(board: GameState) -> bytes:
+    # GameState keeps each player's guesses apart, so the turn order is
+    # rebuilt assuming player one moved first and turns alternated, as they
+    # do in every game mode
+    if board.config is not standard:
+        raise ValueError("Only games on the standard board can be recorded")
+    shots = bytearray()
+    for player1_guess, player2_guess in zip_longest(
+        board.player1_guesses, board.player2_guesses
+    ):
+        if player1_guess is not None:
+            shots.append(player1_guess[0] * 10 + player1_guess[1])
+        if player2_guess is not None:
+            shots.append((player2_guess[0] * 10 + player2_guess[1]) | PLAYER_TWO_SHOT)
+    return (
+        bytes((len(shots),))
+        + encode_fleet(board.get_fleet(Player.ONE))
+        + encode_fleet(board.get_fleet(Player.TWO))
+        + shots
+    )
+
+
+class GameRecordWriter:
+    # appends records to a file; writes are buffered, so millions of games
+    # cost a handful of syscalls
+    def __init__(self, path: str, buffer_size: int = 1 << 20) -> None:
+        self.file: BinaryIO = open(path, "ab", buffering=buffer_size)
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.games = 0
+
+    def write(self, board: GameState) -> None:
+        self.file.write(encode_record(board))
+        self.games += 1
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class GameRecordReader:
+    # memory-maps the file, so iterating touches only the pages it reads and
+    # nothing is loaded up front
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a game record file")
+
+    def iter_raw(self) -> Iterator[tuple[int, int]]:
+        # (offset, shots) of each record, for scans that decode only what
+        # they need
+        data = self.data
+        offset = len(MAGIC)
+        end = len(data)
+        while offset < end:
+            shots = data[offset]
+            yield offset, shots
+            offset += HEADER_SIZE + shots
+
+    def record_at(self, offset: int) -> GameRecord:
+        data = self.data
+        shots = data[offset]
+        fleets = offset + 1
+        return GameRecord(
+            decode_fleet(data[fleets : fleets + FLEET_SIZE]),
+            decode_fleet(data[fleets + FLEET_SIZE : fleets + 2 * FLEET_SIZE]),
+            data[offset + HEADER_SIZE : offset + HEADER_SIZE + shots],
+        )
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for offset, _ in self.iter_raw():
+            yield self.record_at(offset)
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self) -> "GameRecordReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def record_games(
+    path: str,
+    games: int,
+    random_seed: int | None = None,
+    player1_strategy: str | None = None,
+    player2_strategy: str | None = None,
+) -> None:
+    if random_seed is not None:
+        seed(random_seed)
+    with GameRecordWriter(path) as writer:
+        for _ in range(games):
+            board = GameState()
+            play_ai_game(board, player1_strategy, player2_strategy)
+            writer.write(board)
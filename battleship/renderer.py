@@ -0,0 +1,88 @@
+import re
+import sys
+from typing import TextIO
+
+from .enums import ShipState
+from .ui import Color
+
+ANSI_PATTERN = re.compile(r"\033\[[0-9;]*m")
+
+# a frame is a list of screen rows, each split into segments that can be
+# redrawn on their own (a row label, then one segment per board cell)
+Frame = list[tuple[str, ...]]
+
+
+def build_glyphs() -> dict[tuple[bool, int, bool], str]:
+    # (guess view, ShipState value, highlighted) -> cell string, 2 columns wide
+    glyphs = {}
+    for guess in (False, True):
+        for highlighted in (False, True):
+            prefix = Color.FG.lightgreen if highlighted else ""
+            cells = {
+                ShipState.EMPTY: f"{prefix}•{Color.reset} ",
+                ShipState.INTACT: f"{prefix}•{Color.reset} "
+                if guess
+                else f"{Color.FG.yellow}{prefix}O{Color.reset} ",
+                ShipState.HIT: f"{Color.FG.lightred}{prefix}X{Color.reset} ",
+                ShipState.SUNK: f"{Color.FG.red}{prefix}S{Color.reset} ",
+                ShipState.WRONG_GUESS: f"{Color.FG.cyan}{prefix}•{Color.reset} ",
+            }
+            for state, cell in cells.items():
+                glyphs[(guess, state.value, highlighted)] = cell
+    return glyphs
+
+
+glyphs = build_glyphs()
+row_labels = [f"{Color.FG.lightblue}{i}{Color.reset} " for i in range(10)]
+
+
+class Renderer:
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+        self.frame: Frame | None = None
+        self.widths: dict[str, int] = {}
+
+    def width(self, segment: str) -> int:
+        if segment not in self.widths:
+            self.widths[segment] = len(ANSI_PATTERN.sub("", segment))
+        return self.widths[segment]
+
+    def diff_row(self, row: int, old: tuple[str, ...], new: tuple[str, ...]) -> str:
+        # rewrite only the segments that changed, or the whole row when the
+        # layout moved underneath them
+        if len(old) == len(new):
+            out = []
+            column = 1
+            for old_segment, segment in zip(old, new):
+                width = self.width(segment)
+                if segment != old_segment:
+                    if width != self.width(old_segment):
+                        break
+                    out.append(f"\033[{row};{column}H{segment}")
+                column += width
+            else:
+                return "".join(out)
+        return f"\033[{row};1H{''.join(new)}\033[K"
+
+    def draw(self, frame: Frame) -> None:
+        out = []
+        previous = self.frame
+        if previous is None:
+            out.append("\033[H\033[2J")
+            previous = []
+        for row, segments in enumerate(frame):
+            if row >= len(previous):
+                out.append(f"\033[{row + 1};1H{''.join(segments)}\033[K")
+            elif previous[row] != segments:
+                out.append(self.diff_row(row + 1, previous[row], segments))
+        for row in range(len(frame), len(previous)):
+            out.append(f"\033[{row + 1};1H\033[K")
+        # park the cursor under the frame so anything printed later follows it
+        out.append(f"\033[{len(frame) + 1};1H")
+        self.frame = frame
+        self.stream.write("".join(out))
+        self.stream.flush()
+
+    def reset(self) -> None:
+        # the next frame is drawn from scratch on a cleared screen
+        self.frame = None
@@ -0,0 +1,309 @@
+import asyncio
+from argparse import ArgumentParser
+from enum import Enum
+from itertools import count
+from struct import Struct
+
+from .enums import Direction, Player, ShipState, ship_names
+from .errors import InvalidGuessError, InvalidShipPlacementError, ProtocolError
+from .state import GameState
+
+# Wire protocol: every message is one opcode byte followed by a payload whose
+# size is fixed by the opcode, so there is no length prefix to parse.
+#
+#   client -> server
+#     JOIN    u32 game id (0 pairs with the next player also joining 0)
+#     PLACE   u8 ship index in ship_names, u8 x, u8 y, u8 Direction value
+#     FIRE    u8 cell (row * 10 + col)
+#   server -> client
+#     JOINED  u32 game id, u8 your player number
+#     PLACED  u8 ship index
+#     START   u8 player to move first
+#     RESULT  u8 player who fired, u8 cell, u8 ShipState value
+#     OVER    u8 winning player
+#     ERROR   u8 ErrorCode value
+
+
+class Opcode(Enum):
+    JOIN = 0x01
+    PLACE = 0x02
+    FIRE = 0x03
+    JOINED = 0x81
+    PLACED = 0x82
+    START = 0x83
+    RESULT = 0x84
+    OVER = 0x85
+    ERROR = 0x8F
+
+
+class ErrorCode(Enum):
+    PROTOCOL = 1
+    PLACEMENT = 2
+    GUESS = 3
+    NOT_YOUR_TURN = 4
+    NO_GAME = 5
+
+
+payloads: dict[int, Struct] = {
+    Opcode.JOIN.value: Struct("!I"),
+    Opcode.PLACE.value: Struct("!BBBB"),
+    Opcode.FIRE.value: Struct("!B"),
+    Opcode.JOINED.value: Struct("!IB"),
+    Opcode.PLACED.value: Struct("!B"),
+    Opcode.START.value: Struct("!B"),
+    Opcode.RESULT.value: Struct("!BBB"),
+    Opcode.OVER.value: Struct("!B"),
+    Opcode.ERROR.value: Struct("!B"),
+}
+
+ship_order = list(ship_names)
+
+
+def encode(opcode: Opcode, *fields: int) -> bytes:
+    return bytes((opcode.value,)) + payloads[opcode.value].pack(*fields)
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[Opcode, tuple]:
+    # client side counterpart of Connection.data_received
+    opcode = (await reader.readexactly(1))[0]
+    if opcode not in payloads:
+        raise ProtocolError(f"Unknown opcode {opcode:#x}")
+    payload = payloads[opcode]
+    return Opcode(opcode), payload.unpack(await reader.readexactly(payload.size))
+
+
+class Connection(asyncio.Protocol):
+    # one per client socket; messages are parsed straight out of
+    # data_received without a reader task, which keeps per-move overhead to
+    # a couple of callbacks
+    def __init__(self, server: "GameServer") -> None:
+        self.server = server
+        self.transport: asyncio.Transport | None = None
+        self.buffer = b""
+        self.game: "ServerGame | None" = None
+        self.player: Player | None = None
+        self.finished = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self.buffer + data if self.buffer else data
+        offset = 0
+        try:
+            while offset < len(buffer) and not self.finished:
+                opcode = buffer[offset]
+                payload = payloads.get(opcode)
+                if payload is None:
+                    raise ProtocolError(f"Unknown opcode {opcode:#x}")
+                end = offset + 1 + payload.size
+                if end > len(buffer):
+                    break
+                self.server.dispatch(
+                    self, opcode, payload.unpack_from(buffer, offset + 1)
+                )
+                offset = end
+        except ProtocolError:
+            self.send(encode(Opcode.ERROR, ErrorCode.PROTOCOL.value))
+            self.finish()
+            return
+        self.buffer = buffer[offset:]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.server.leave(self)
+
+    # a peer that is slow to read stops being read from until its replies
+    # drain, so it cannot queue up unbounded work; one that stops reading
+    # altogether is dropped once its buffer passes max_buffer
+    def pause_writing(self) -> None:
+        self.transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        self.transport.resume_reading()
+
+    def send(self, message: bytes) -> None:
+        transport = self.transport
+        if self.finished or transport.is_closing():
+            return
+        transport.write(message)
+        if transport.get_write_buffer_size() > self.server.max_buffer:
+            transport.abort()
+
+    def finish(self) -> None:
+        # half-close so moves already in flight from the client are not
+        # answered with a reset, and hang up for good if it never closes
+        if self.finished:
+            return
+        self.finished = True
+        self.transport.write_eof()
+        asyncio.get_running_loop().call_later(self.server.linger, self.transport.close)
+
+
+class ServerGame:
+    __slots__ = ("game_id", "state", "connections", "turn", "started")
+
+    def __init__(self, game_id: int) -> None:
+        self.game_id = game_id
+        self.state = GameState()
+        self.connections: dict[Player, Connection] = {}
+        self.turn = Player.ONE
+        self.started = False
+
+    def broadcast(self, message: bytes) -> None:
+        for connection in self.connections.values():
+            connection.send(message)
+
+
+class GameServer:
+    def __init__(self, max_buffer: int = 1024 * 1024, linger: float = 5.0) -> None:
+        self.max_buffer = max_buffer
+        self.linger = linger
+        self.games: dict[int, ServerGame] = {}
+        self.game_ids = count(1)
+        self.waiting: ServerGame | None = None
+        self.server: asyncio.Server | None = None
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0, backlog: int = 1024
+    ) -> int:
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            lambda: Connection(self), host, port, backlog=backlog
+        )
+        return self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.server.serve_forever()
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def dispatch(self, connection: Connection, opcode: int, fields: tuple) -> None:
+        if opcode == Opcode.FIRE.value:
+            self.fire(connection, *fields)
+        elif opcode == Opcode.PLACE.value:
+            self.place(connection, *fields)
+        elif opcode == Opcode.JOIN.value:
+            self.join(connection, *fields)
+        else:
+            raise ProtocolError(f"Unexpected {Opcode(opcode).name}")
+
+    def join(self, connection: Connection, game_id: int) -> None:
+        if connection.game is not None:
+            raise ProtocolError("Already in a game")
+        if game_id == 0:
+            if self.waiting is None:
+                self.waiting = self.new_game()
+            game = self.waiting
+        else:
+            game = self.games.get(game_id) or self.new_game(game_id)
+        # a started game is full or lost a player, who cannot be replaced
+        if len(game.connections) == 2 or game.started:
+            connection.send(encode(Opcode.ERROR, ErrorCode.NO_GAME.value))
+            return
+
+        player = Player.TWO if Player.ONE in game.connections else Player.ONE
+        game.connections[player] = connection
+        connection.game = game
+        connection.player = player
+        if len(game.connections) == 2 and game is self.waiting:
+            self.waiting = None
+        connection.send(encode(Opcode.JOINED, game.game_id, player.value))
+
+    def new_game(self, game_id: int | None = None) -> ServerGame:
+        while game_id is None or game_id in self.games:
+            game_id = next(self.game_ids)
+        game = ServerGame(game_id)
+        self.games[game.game_id] = game
+        return game
+
+    def place(
+        self, connection: Connection, ship: int, x: int, y: int, direction: int
+    ) -> None:
+        game = connection.game
+        if game is None or game.started:
+            raise ProtocolError("Not placing ships")
+        if ship >= len(ship_order) or direction > 1:
+            raise ProtocolError("Unknown ship or direction")
+        try:
+            game.state.place_ship(
+                connection.player, ship_order[ship], x, y, Direction(direction)
+            )
+        except InvalidShipPlacementError:
+            connection.send(encode(Opcode.ERROR, ErrorCode.PLACEMENT.value))
+            return
+        connection.send(encode(Opcode.PLACED, ship))
+
+        if len(game.connections) == 2 and all(
+            len(getattr(game.state, f"player{player.value}_ships")) == len(ship_order)
+            for player in Player
+        ):
+            game.started = True
+            game.broadcast(encode(Opcode.START, game.turn.value))
+
+    def fire(self, connection: Connection, cell: int) -> None:
+        game = connection.game
+        if game is None or not game.started:
+            raise ProtocolError("Game has not started")
+        if connection.player != game.turn:
+            connection.send(encode(Opcode.ERROR, ErrorCode.NOT_YOUR_TURN.value))
+            return
+        if cell >= 100:
+            raise ProtocolError(f"Cell {cell} is off the board")
+        try:
+            update = game.state.fire(connection.player, divmod(cell, 10))
+        except InvalidGuessError:
+            connection.send(encode(Opcode.ERROR, ErrorCode.GUESS.value))
+            return
+
+        # change_state reports the last sinking as None, the game is over
+        state = ShipState.SUNK if update is None else update
+        game.broadcast(encode(Opcode.RESULT, game.turn.value, cell, state.value))
+        if update is None:
+            game.broadcast(encode(Opcode.OVER, game.turn.value))
+            self.end(game)
+        game.turn = Player.TWO if game.turn == Player.ONE else Player.ONE
+
+    def leave(self, connection: Connection) -> None:
+        game = connection.game
+        if game is None:
+            return
+        del game.connections[connection.player]
+        connection.game = None
+        if game.started and not game.state.game_ended and game.connections:
+            # whoever is still connected wins by forfeit
+            game.broadcast(encode(Opcode.OVER, next(iter(game.connections)).value))
+            self.end(game)
+        if game is self.waiting:
+            self.waiting = None
+        if not game.connections:
+            self.games.pop(game.game_id, None)
+
+    def end(self, game: ServerGame) -> None:
+        # a finished game is dropped at once rather than when its players
+        # hang up, so its id cannot be joined while they linger
+        for player_connection in game.connections.values():
+            player_connection.finish()
+        self.games.pop(game.game_id, None)
+        if game is self.waiting:
+            self.waiting = None
+
+
+def server_main(argv: list[str] | None = None) -> None:
+    parser = ArgumentParser(description="Host Battleship games over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-buffer", type=int, default=1024 * 1024)
+    args = parser.parse_args(argv)
+
+    async def serve() -> None:
+        server = GameServer(args.max_buffer)
+        port = await server.start(args.host, args.port)
+        print(f"Serving Battleship on {args.host}:{port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,517 @@
+from functools import lru_cache
+from struct import Struct
+from typing import TYPE_CHECKING
+
+from .bitboard import (
+    BitBoard,
+    Fleet,
+    GameConfig,
+    Placement,
+    iter_bits,
+    mask_coords,
+    placement_numbers,
+    placements,
+    random_fleet,
+    standard,
+)
+from .enums import Direction, Player, ShipState, ship_names
+from .errors import InvalidGuessError, InvalidShipPlacementError
+from .symmetry import canonical_hash, sunk_keys, zobrist_hash, zobrist_keys
+
+if TYPE_CHECKING:
+    from .fleets import FleetLibrary
+
+# Snapshot layout: the AI strategy's index in ai_strategies, then per player
+# the fleet (each ship's index into placements[ship], UNPLACED if it is not
+# on the board yet), the hit and miss masks, the shot count and the guesses
+# in order, one byte per cell padded to 100
+SNAPSHOT = Struct("<B" + "5s13s13sB100s" * 2)
+UNPLACED = 0xFF
+
+cell_coords = [divmod(cell, 10) for cell in range(100)]
+mask_numbers: dict[int, int] = {
+    placement.mask: number for placement, number in placement_numbers.items()
+}
+
+
+@lru_cache(maxsize=4096)
+def fleet_layout(
+    fleet: bytes,
+) -> tuple[tuple[tuple[str, int, list[int], list[int]], ...], tuple, int]:
+    # everything about a fleet that play never changes, built once per fleet:
+    # (ship, mask, xs, ys) per placed ship, the cell -> ship table and the
+    # combined ship mask
+    ships = []
+    cells: list[str | None] = [None] * 100
+    occupied = 0
+    for ship, number in zip(ship_names, fleet):
+        if number == UNPLACED:
+            continue
+        placement = placements[ship][number]
+        length = ship_names[ship].value
+        if placement.direction == Direction.HORIZONTAL:
+            xs = [placement.x + i for i in range(length)]
+            ys = [placement.y] * length
+        else:
+            xs = [placement.x] * length
+            ys = [placement.y + i for i in range(length)]
+        ships.append((ship, placement.mask, xs, ys))
+        for index in iter_bits(placement.mask):
+            cells[index] = ship
+        occupied |= placement.mask
+    return tuple(ships), tuple(cells), occupied
+
+
+class GameState:
+    # rules and state only, no I/O; Board adds the terminal UI on top
+    __slots__ = (
+        "ai_strategy",
+        "ai_cache",
+        "config",
+        "player1_bits",
+        "player2_bits",
+        "player1_ships",
+        "player2_ships",
+        "player1_ship_bits",
+        "player2_ship_bits",
+        "player1_cells",
+        "player2_cells",
+        "player1_ship_hp",
+        "player2_ship_hp",
+        "player1_ships_left",
+        "player2_ships_left",
+        "player1_guesses",
+        "player2_guesses",
+        "player1_shots",
+        "player2_shots",
+        "player1_hash",
+        "player2_hash",
+    )
+
+    def __init__(
+        self, ai_strategy: str = "heuristic", config: GameConfig = standard
+    ) -> None:
+        self.ai_strategy = ai_strategy
+        self.config = config
+        # per-game memory for strategies that keep state between moves; it
+        # only ever holds what can be rebuilt from the board
+        self.ai_cache: dict = {}
+
+        self.player1_bits = BitBoard()
+        self.player2_bits = BitBoard()
+
+        self.player1_ships: dict[str, dict[str, list]] = {}
+        self.player2_ships: dict[str, dict[str, list]] = {}
+        self.player1_ship_bits: dict[str, int] = {}
+        self.player2_ship_bits: dict[str, int] = {}
+
+        # cell index (y * width + x) -> ship occupying it, and hits left per ship
+        self.player1_cells: list[str | None] = [None] * config.cells
+        self.player2_cells: list[str | None] = [None] * config.cells
+        self.player1_ship_hp: dict[str, int] = {}
+        self.player2_ship_hp: dict[str, int] = {}
+        self.player1_ships_left: int = 0
+        self.player2_ships_left: int = 0
+
+        self.player1_guesses: list[tuple[int, int]] = []
+        self.player2_guesses: list[tuple[int, int]] = []
+
+        self.player1_shots: int = 0
+        self.player2_shots: int = 0
+
+        # Zobrist hashes of what each board has revealed, kept for every
+        # symmetric image at once, see symmetry.zobrist_keys
+        self.player1_hash: int = 0
+        self.player2_hash: int = 0
+
+    def copy(self) -> "GameState":
+        # ship coordinate lists are never mutated after placement, so they are
+        # shared; everything that changes during play is copied
+        state = GameState.__new__(GameState)
+        state.ai_strategy = self.ai_strategy
+        state.ai_cache = dict(self.ai_cache)
+        state.config = self.config
+        for player in ("player1", "player2"):
+            setattr(state, f"{player}_bits", getattr(self, f"{player}_bits").copy())
+            setattr(
+                state,
+                f"{player}_ships",
+                {
+                    ship: dict(info)
+                    for ship, info in getattr(self, f"{player}_ships").items()
+                },
+            )
+            setattr(
+                state, f"{player}_ship_bits", dict(getattr(self, f"{player}_ship_bits"))
+            )
+            setattr(state, f"{player}_cells", list(getattr(self, f"{player}_cells")))
+            setattr(
+                state, f"{player}_ship_hp", dict(getattr(self, f"{player}_ship_hp"))
+            )
+            setattr(
+                state, f"{player}_ships_left", getattr(self, f"{player}_ships_left")
+            )
+            setattr(
+                state, f"{player}_guesses", list(getattr(self, f"{player}_guesses"))
+            )
+            setattr(state, f"{player}_shots", getattr(self, f"{player}_shots"))
+            setattr(state, f"{player}_hash", getattr(self, f"{player}_hash"))
+        return state
+
+    def snapshot(self) -> bytes:
+        # a fixed-size immutable copy of the whole game, cheap to hash, compare
+        # and pickle; restore() turns it back into a live state. The layout is
+        # fixed to the standard board and fleet
+        from .ai import ai_strategies
+
+        if self.config is not standard:
+            raise ValueError("Snapshots only cover the standard board and fleet")
+        fields: list = [list(ai_strategies).index(self.ai_strategy)]
+        for player in ("player1", "player2"):
+            ship_bits = getattr(self, f"{player}_ship_bits")
+            bits = getattr(self, f"{player}_bits")
+            guesses = getattr(self, f"{player}_guesses")
+            fields += [
+                bytes(
+                    [
+                        mask_numbers[ship_bits[ship]] if ship in ship_bits else UNPLACED
+                        for ship in ship_names
+                    ]
+                ),
+                bits.hits.to_bytes(13, "little"),
+                bits.misses.to_bytes(13, "little"),
+                len(guesses),
+                bytes([row * 10 + col for row, col in guesses]),
+            ]
+        return SNAPSHOT.pack(*fields)
+
+    def restore(self, snapshot: bytes) -> None:
+        # overwrites the game in place, so a Board keeps its UI state
+        from .ai import ai_strategies
+
+        strategy, *fields = SNAPSHOT.unpack(snapshot)
+        self.ai_strategy = list(ai_strategies)[strategy]
+        self.ai_cache = {}
+        self.config = standard
+        for player, offset in (("player1", 0), ("player2", 5)):
+            fleet, hits, misses, shots, guesses = fields[offset : offset + 5]
+            layout, cells, occupied = fleet_layout(fleet)
+            bits = BitBoard()
+            bits.ships = occupied
+            bits.hits = int.from_bytes(hits, "little")
+            bits.misses = int.from_bytes(misses, "little")
+
+            ships = {}
+            ship_bits = {}
+            ship_hp = {}
+            ships_left = 0
+            for ship, mask, xs, ys in layout:
+                hp = len(xs) - (mask & bits.hits).bit_count()
+                ships[ship] = {"x": xs, "y": ys, "sunk": not hp}
+                ship_bits[ship] = mask
+                ship_hp[ship] = hp
+                if hp:
+                    ships_left += 1
+                else:
+                    bits.sunk |= mask
+
+            setattr(self, f"{player}_bits", bits)
+            setattr(self, f"{player}_ships", ships)
+            setattr(self, f"{player}_ship_bits", ship_bits)
+            setattr(self, f"{player}_cells", list(cells))
+            setattr(self, f"{player}_ship_hp", ship_hp)
+            setattr(self, f"{player}_ships_left", ships_left)
+            setattr(
+                self,
+                f"{player}_guesses",
+                list(map(cell_coords.__getitem__, guesses[:shots])),
+            )
+            setattr(self, f"{player}_shots", shots)
+            setattr(
+                self,
+                f"{player}_hash",
+                zobrist_hash(
+                    bits,
+                    standard,
+                    (len(xs) for ship, _, xs, _ in layout if ships[ship]["sunk"]),
+                ),
+            )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: bytes) -> "GameState":
+        state = cls.__new__(cls)
+        state.restore(snapshot)
+        return state
+
+    def get_player_coords(self, player: Player) -> list[tuple[int, int]]:
+        coords = []
+        for ship in getattr(self, f"player{player.value}_ships"):
+            for x, y in zip(
+                getattr(self, f"player{player.value}_ships")[ship]["x"],
+                getattr(self, f"player{player.value}_ships")[ship]["y"],
+            ):
+                coords.append((x, y))
+        return coords
+
+    @property
+    def player1(self) -> list[list[int]]:
+        return self.player1_bits.grid(self.config.width, self.config.height)
+
+    @property
+    def player2(self) -> list[list[int]]:
+        return self.player2_bits.grid(self.config.width, self.config.height)
+
+    @property
+    def player1_coords(self) -> list[tuple[int, int]]:
+        return self.get_player_coords(Player.ONE)
+
+    @property
+    def player2_coords(self) -> list[tuple[int, int]]:
+        return self.get_player_coords(Player.TWO)
+
+    def get_hit_coords(self, player: Player) -> list[tuple[int, int]]:
+        # return coordinates of hit coordinates on the player's board
+        bits = getattr(self, f"player{player.value}_bits")
+        return sorted(mask_coords(bits.hits & ~bits.sunk, self.config.width))
+
+    def get_miss_coords(self, player: Player) -> list[tuple[int, int]]:
+        return mask_coords(
+            getattr(self, f"player{player.value}_bits").misses, self.config.width
+        )
+
+    def get_guessed_coords(self, player: Player) -> list[tuple[int, int]]:
+        return mask_coords(
+            getattr(self, f"player{player.value}_bits").guessed, self.config.width
+        )
+
+    @property
+    def ai_x(self) -> list[tuple[int, int]]:
+        return self.get_hit_coords(Player.ONE)
+
+    @property
+    def ai_misses(self) -> list[tuple[int, int]]:
+        return self.get_miss_coords(Player.ONE)
+
+    @property
+    def all_ai_guesses(self) -> list[tuple[int, int]]:
+        return self.get_guessed_coords(Player.ONE)
+
+    @property
+    def game_ended(self) -> bool:
+        return self.player1_ships_left == 0 or self.player2_ships_left == 0
+
+    def get_player_down(self, player: Player) -> list[tuple[int, int]]:
+        return sorted(
+            mask_coords(
+                getattr(self, f"player{1 if player.value == 2 else 2}_bits").hits,
+                self.config.width,
+            )
+        )
+
+    def accuracy(self, player: Player) -> float:
+        # share of player's shots that hit, 0.0 before the first; a fleet
+        # sunk by one shot ends the game before the other player fires
+        shots = getattr(self, f"player{player.value}_shots")
+        return len(self.get_player_down(player)) / shots if shots else 0.0
+
+    def place_ship(
+        self, player: Player, ship: str, x: int, y: int, direction: Direction
+    ) -> None:
+        # Error checking
+        if ship in getattr(self, f"player{player.value}_ships"):
+            raise InvalidShipPlacementError(
+                f"Player {player.value} has already placed a {ship}"
+            )
+
+        if ship not in self.config.fleet:
+            raise InvalidShipPlacementError(f"There is no {ship} in this fleet")
+        length = self.config.fleet[ship]
+
+        if direction == Direction.HORIZONTAL and x + length > self.config.width:
+            raise InvalidShipPlacementError(
+                f"Ship {ship} cannot be placed at {x}, {y} horizontally"
+            )
+
+        if direction == Direction.VERTICAL and y + length > self.config.height:
+            raise InvalidShipPlacementError(
+                f"Ship {ship} cannot be placed at {x}, {y} vertically"
+            )
+
+        placement = self.config.placement_index.get((ship, x, y, direction))
+        if (
+            placement is None
+            or placement.mask & getattr(self, f"player{player.value}_bits").ships
+        ):
+            raise InvalidShipPlacementError(f"Ship {ship} cannot be placed at {x}, {y}")
+        self.add_ship(player, ship, placement)
+
+    def can_place(
+        self, player: Player, ship: str, x: int, y: int, direction: Direction
+    ) -> bool:
+        # place_ship's checks without raising, for generators that try many
+        # placements
+        placement = self.config.placement_index.get((ship, x, y, direction))
+        return (
+            placement is not None
+            and ship not in getattr(self, f"player{player.value}_ships")
+            and not placement.mask & getattr(self, f"player{player.value}_bits").ships
+        )
+
+    def add_ship(self, player: Player, ship: str, placement: Placement) -> None:
+        # places a ship that is known to fit, see can_place
+        x, y, direction = placement.x, placement.y, placement.direction
+        length = self.config.fleet[ship]
+        mask = placement.mask
+
+        getattr(self, f"player{player.value}_ships")[ship] = {
+            "x": [x + i for i in range(length)]
+            if direction == Direction.HORIZONTAL
+            else [x] * length,
+            "y": [y] * length
+            if direction == Direction.HORIZONTAL
+            else [y + i for i in range(length)],
+            "sunk": False,
+        }
+
+        cells = getattr(self, f"player{player.value}_cells")
+        for index in iter_bits(mask):
+            cells[index] = ship
+        getattr(self, f"player{player.value}_ship_bits")[ship] = mask
+        getattr(self, f"player{player.value}_bits").ships |= mask
+        getattr(self, f"player{player.value}_ship_hp")[ship] = length
+        if player == Player.ONE:
+            self.player1_ships_left += 1
+        elif player == Player.TWO:
+            self.player2_ships_left += 1
+
+    def change_state(self, player: Player, coord: tuple[int, int]) -> ShipState | None:
+        bits: BitBoard = getattr(self, f"player{player.value}_bits")
+        index = coord[0] * self.config.width + coord[1]
+        cell = 1 << index
+        if bits.guessed & cell:
+            raise InvalidGuessError(
+                f"Player {2 if player.value == 1 else 1} has already guessed {coord}"
+            )
+        ship = getattr(self, f"player{player.value}_cells")[index]
+        miss_keys, hit_keys, sink_keys = zobrist_keys(self.config)
+        if ship is None:
+            bits.misses |= cell
+            if player == Player.ONE:
+                self.player1_hash ^= miss_keys[index]
+            elif player == Player.TWO:
+                self.player2_hash ^= miss_keys[index]
+            return ShipState.WRONG_GUESS
+
+        bits.hits |= cell
+        if player == Player.ONE:
+            self.player1_hash ^= hit_keys[index]
+        elif player == Player.TWO:
+            self.player2_hash ^= hit_keys[index]
+        ship_hp = getattr(self, f"player{player.value}_ship_hp")
+        ship_hp[ship] -= 1
+        if ship_hp[ship]:
+            return ShipState.HIT
+
+        ship_mask = getattr(self, f"player{player.value}_ship_bits")[ship]
+        bits.sunk |= ship_mask
+        # ships of one length sink in turn, the n-th XORing in the n-th key
+        ships = getattr(self, f"player{player.value}_ships")
+        length = self.config.fleet[ship]
+        sink = sunk_keys(self.config)[length][
+            sum(
+                1
+                for other in ships
+                if ships[other]["sunk"] and self.config.fleet[other] == length
+            )
+        ]
+        for ship_cell in iter_bits(ship_mask):
+            sink ^= sink_keys[ship_cell]
+        if player == Player.ONE:
+            self.player1_hash ^= sink
+        elif player == Player.TWO:
+            self.player2_hash ^= sink
+        ships[ship]["sunk"] = True
+        if player == Player.ONE:
+            self.player1_ships_left -= 1
+        elif player == Player.TWO:
+            self.player2_ships_left -= 1
+        if self.game_ended:
+            return
+        return ShipState.SUNK
+
+    def state_hash(self, player: Player) -> int:
+        # 64-bit hash of what player's board has revealed, equal for all of
+        # its rotations and reflections
+        return canonical_hash(getattr(self, f"player{player.value}_hash"), self.config)
+
+    def can_fire(self, player: Player, coord: tuple[int, int]) -> bool:
+        # whether player may shoot at coord (row, col): on the board and not
+        # guessed before, answered from the opponent's guessed bitboard
+        row, col = coord
+        if not (0 <= row < self.config.height and 0 <= col < self.config.width):
+            return False
+        target = Player.TWO if player == Player.ONE else Player.ONE
+        bits: BitBoard = getattr(self, f"player{target.value}_bits")
+        return not bits.guessed >> (row * self.config.width + col) & 1
+
+    def fire(self, player: Player, coord: tuple[int, int]) -> ShipState | None:
+        # player fires at the opponent's board and the shot is recorded
+        update = self.change_state(
+            Player.TWO if player == Player.ONE else Player.ONE, coord
+        )
+        if player == Player.ONE:
+            self.player1_shots += 1
+            self.player1_guesses.append(coord)
+        elif player == Player.TWO:
+            self.player2_shots += 1
+            self.player2_guesses.append(coord)
+        return update
+
+    def place_ai_guess(
+        self, player: Player = Player.TWO, strategy: str | None = None
+    ) -> None:
+        # the strategies need numpy, so they are imported on the first AI move
+        # rather than with the rules
+        from .ai import ai_strategies
+
+        guess = ai_strategies[strategy or self.ai_strategy]
+        coord = guess(self, player)
+        while not self.can_fire(player, coord):
+            coord = guess(self, player)
+        self.fire(player, coord)
+
+    def get_fleet(self, player: Player) -> Fleet:
+        ships = getattr(self, f"player{player.value}_ships")
+        fleet = []
+        for ship in self.config.fleet:
+            info = ships[ship]
+            direction = (
+                Direction.VERTICAL
+                if info["x"][0] == info["x"][-1]
+                else Direction.HORIZONTAL
+            )
+            fleet.append(
+                self.config.placement_index[
+                    (ship, info["x"][0], info["y"][0], direction)
+                ]
+            )
+        return tuple(fleet)
+
+    def place_fleet(self, player: Player, fleet: Fleet) -> None:
+        for ship, placement in zip(self.config.fleet, fleet):
+            if not self.can_place(
+                player, ship, placement.x, placement.y, placement.direction
+            ):
+                raise InvalidShipPlacementError(
+                    f"Ship {ship} cannot be placed at {placement.x}, {placement.y}"
+                )
+            self.add_ship(player, ship, placement)
+
+    def place_ai_ships(
+        self, player: Player = Player.TWO, library: "FleetLibrary | None" = None
+    ) -> None:
+        # a layout from the library when one is given, see fleets.py
+        if library is not None:
+            self.place_fleet(player, library.draw(self.config))
+        else:
+            self.place_fleet(player, random_fleet(self.config))
@@ -0,0 +1,142 @@
+from collections import Counter
+from functools import lru_cache
+from random import Random
+from typing import Iterable
+
+from .bitboard import BitBoard, GameConfig, iter_bits
+
+ZOBRIST_BITS = 64
+ZOBRIST_MASK = (1 << ZOBRIST_BITS) - 1
+
+
+@lru_cache(maxsize=None)
+def symmetries(config: GameConfig) -> list[list[int]]:
+    # cell -> cell permutations for every rotation and reflection that maps
+    # the board onto itself, identity first: 8 for a square board, 4 otherwise
+    width, height = config.width, config.height
+    maps = [
+        lambda x, y: (x, y),
+        lambda x, y: (width - 1 - x, y),
+        lambda x, y: (x, height - 1 - y),
+        lambda x, y: (width - 1 - x, height - 1 - y),
+    ]
+    if width == height:
+        maps += [
+            lambda x, y: (y, x),
+            lambda x, y: (width - 1 - y, x),
+            lambda x, y: (y, height - 1 - x),
+            lambda x, y: (width - 1 - y, height - 1 - x),
+        ]
+    permutations = []
+    for transform in maps:
+        permutation = []
+        for cell in range(config.cells):
+            x, y = transform(cell % width, cell // width)
+            permutation.append(y * width + x)
+        permutations.append(permutation)
+    return permutations
+
+
+@lru_cache(maxsize=None)
+def inverse_symmetries(config: GameConfig) -> list[list[int]]:
+    inverses = []
+    for permutation in symmetries(config):
+        inverse = [0] * config.cells
+        for cell, image in enumerate(permutation):
+            inverse[image] = cell
+        inverses.append(inverse)
+    return inverses
+
+
+def transform_mask(mask: int, permutation: list[int]) -> int:
+    moved = 0
+    for cell in iter_bits(mask):
+        moved |= 1 << permutation[cell]
+    return moved
+
+
+def canonical_masks(config: GameConfig, *masks: int) -> tuple[tuple[int, ...], int]:
+    # the smallest image of the masks over the board's symmetries, and the
+    # index of the symmetry that produced it; a cell chosen in the canonical
+    # frame maps back with inverse_symmetries(config)[index]
+    best: tuple[int, ...] | None = None
+    best_index = 0
+    for index, permutation in enumerate(symmetries(config)):
+        image = tuple(transform_mask(mask, permutation) for mask in masks)
+        if best is None or image < best:
+            best = image
+            best_index = index
+    return best, best_index
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(config: GameConfig) -> tuple[list[int], list[int], list[int]]:
+    # per cell, the keys XORed into a board hash for a miss, a hit, and a hit
+    # turning into a sunk cell. Each key packs one 64-bit key per symmetry,
+    # the key of the cell's image under it, so a single XOR keeps the hash of
+    # every symmetric image of the board up to date at once. Keys are seeded
+    # from the board size so hashes agree between processes
+    rng = Random(f"zobrist {config.width}x{config.height}")
+    base = [
+        [rng.getrandbits(ZOBRIST_BITS) for _ in range(config.cells)] for _ in range(3)
+    ]
+    packed = []
+    for keys in base:
+        packed.append(
+            [
+                sum(
+                    keys[permutation[cell]] << (ZOBRIST_BITS * index)
+                    for index, permutation in enumerate(symmetries(config))
+                )
+                for cell in range(config.cells)
+            ]
+        )
+    miss, hit, sunk = packed
+    return miss, hit, [hit_key ^ sunk_key for hit_key, sunk_key in zip(hit, sunk)]
+
+
+@lru_cache(maxsize=None)
+def sunk_keys(config: GameConfig) -> dict[int, list[int]]:
+    # per ship length, the keys XORed in as the first, second, ... ship of
+    # that length sinks, so the hash tells apart boards that look the same
+    # but have different ships left afloat. Which ship sank does not move
+    # with the board, so every symmetry gets the same 64-bit key
+    rng = Random(f"zobrist sunk {config.width}x{config.height}")
+    lengths = Counter(config.fleet.values())
+    return {
+        length: [
+            rng.getrandbits(ZOBRIST_BITS)
+            * sum(
+                1 << (ZOBRIST_BITS * index) for index in range(len(symmetries(config)))
+            )
+            for _ in range(count)
+        ]
+        for length, count in sorted(lengths.items())
+    }
+
+
+def zobrist_hash(
+    bits: BitBoard, config: GameConfig, sunk_lengths: Iterable[int] = ()
+) -> int:
+    # the packed hash of a board from scratch, with the lengths of its sunk
+    # ships, matching what change_state maintains incrementally
+    miss, hit, sink = zobrist_keys(config)
+    packed = 0
+    for length, count in Counter(sunk_lengths).items():
+        for key in sunk_keys(config)[length][:count]:
+            packed ^= key
+    for cell in iter_bits(bits.misses):
+        packed ^= miss[cell]
+    for cell in iter_bits(bits.hits):
+        packed ^= hit[cell]
+    for cell in iter_bits(bits.sunk):
+        packed ^= sink[cell]
+    return packed
+
+
+def canonical_hash(packed: int, config: GameConfig) -> int:
+    # the same 64-bit value for every rotation and reflection of a board
+    return min(
+        packed >> (ZOBRIST_BITS * index) & ZOBRIST_MASK
+        for index in range(len(symmetries(config)))
+    )
@@ -0,0 +1,160 @@
+import json
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from random import seed
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from .ai import ai_strategies, budgeted_strategies
+from .bitboard import Fleet, random_fleet
+from .state import GameState
+from .enums import Player
+from .simulation import play_ai_game
+
+
+def play_solo_game(strategy: str, fleet: Fleet) -> int:
+    # shots the strategy needs to sink a fleet on its own
+    board = GameState()
+    board.place_fleet(Player.ONE, fleet)
+    while board.player1_ships_left:
+        board.place_ai_guess(Player.TWO, strategy)
+    return board.player2_shots
+
+
+def run_tournament_chunk(
+    strategy: str, opponent: str | None, games: int | list[Fleet], chunk_seed: int
+) -> list[tuple[str, int]]:
+    # returns (winning strategy, shots it fired) per game; against a fleet set
+    # the strategy always "wins" and the shots are what it needed to sink it
+    seed(chunk_seed)
+    if opponent is None:
+        return [(strategy, play_solo_game(strategy, fleet)) for fleet in games]
+
+    results = []
+    for game in range(games):
+        # alternate who moves first so neither strategy gets the tempo
+        first, second = (strategy, opponent) if game % 2 == 0 else (opponent, strategy)
+        result = play_ai_game(None, first, second)
+        if result.winner == Player.ONE:
+            results.append((first, result.player1_shots))
+        else:
+            results.append((second, result.player2_shots))
+    return results
+
+
+def shot_stats(shots: list[int]) -> dict[str, float]:
+    if not shots:
+        return {"games": 0}
+    p50, p90, p99 = np.percentile(shots, [50, 90, 99])
+    return {
+        "games": len(shots),
+        "mean": float(np.mean(shots)),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "min": min(shots),
+        "max": max(shots),
+    }
+
+
+def tournament(
+    strategies: list[str] | None = None,
+    games: int = 1000,
+    fleets: list[Fleet] | None = None,
+    workers: int | None = None,
+    chunk_size: int = 100,
+    random_seed: int = 0,
+) -> dict[str, Any]:
+    # with a fleet set every strategy fires at every fleet; otherwise each pair
+    # of strategies plays `games` games against each other. By default every
+    # strategy plays but the budgeted ones, which only play when named
+    strategies = strategies or [
+        strategy for strategy in ai_strategies if strategy not in budgeted_strategies
+    ]
+    jobs: list[tuple[str, str | None, int | list[Fleet]]] = []
+    pairings: list[tuple[str, str]] = []
+    if fleets is not None:
+        for strategy in strategies:
+            for start in range(0, len(fleets), chunk_size):
+                jobs.append((strategy, None, fleets[start : start + chunk_size]))
+    else:
+        pairings = list(combinations(strategies, 2)) or [(strategies[0], strategies[0])]
+        for strategy, opponent in pairings:
+            for start in range(0, games, chunk_size):
+                jobs.append((strategy, opponent, min(chunk_size, games - start)))
+
+    # seeds depend only on the job, never on which worker picks it up
+    seeds = [random_seed * 1_000_003 + index for index in range(len(jobs))]
+    start = perf_counter()
+    if workers == 1:
+        chunks = [run_tournament_chunk(*job, seed) for job, seed in zip(jobs, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(run_tournament_chunk, *zip(*jobs), seeds))
+    elapsed = perf_counter() - start
+
+    shots: dict[str, list[int]] = {strategy: [] for strategy in strategies}
+    wins: dict[tuple[str, str], dict[str, int]] = {
+        pairing: {strategy: 0 for strategy in pairing} for pairing in pairings
+    }
+    for (strategy, opponent, _), chunk in zip(jobs, chunks):
+        for winner, winner_shots in chunk:
+            shots[winner].append(winner_shots)
+            if opponent is not None:
+                wins[(strategy, opponent)][winner] += 1
+
+    total_games = sum(len(chunk) for chunk in chunks)
+    return {
+        "games": total_games,
+        "games_per_second": total_games / elapsed if elapsed else float("inf"),
+        "shots_to_win": {strategy: shot_stats(shots[strategy]) for strategy in shots},
+        "wins": {
+            f"{first} vs {second}": wins[(first, second)] for first, second in pairings
+        },
+    }
+
+
+def tournament_main(argv: list[str] | None = None) -> None:
+    parser = ArgumentParser(description="Play AI guess strategies against each other")
+    parser.add_argument(
+        "strategies",
+        nargs="*",
+        help=f"any of {', '.join(ai_strategies)}; by default all but "
+        f"{', '.join(sorted(budgeted_strategies))}",
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument(
+        "--fleets",
+        type=int,
+        default=0,
+        help="fire at this many fixed random fleets instead of playing matches",
+    )
+    parser.add_argument("--fleet-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    for strategy in args.strategies:
+        if strategy not in ai_strategies:
+            parser.error(f"unknown strategy {strategy}")
+
+    fleets = None
+    if args.fleets:
+        seed(args.fleet_seed)
+        fleets = [random_fleet() for _ in range(args.fleets)]
+    print(
+        json.dumps(
+            tournament(
+                args.strategies,
+                args.games,
+                fleets,
+                args.workers,
+                args.chunk_size,
+                args.seed,
+            ),
+            indent=2,
+        )
+    )
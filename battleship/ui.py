@@ -0,0 +1,67 @@
+from time import sleep
+from typing import Any, Callable
+
+
+class Color:
+    reset = "\033[0m"
+    bold = "\033[01m"
+    disable = "\033[02m"
+    underline = "\033[04m"
+    reverse = "\033[07m"
+    strikethrough = "\033[09m"
+    invisible = "\033[08m"
+
+    class FG:
+        black = "\033[30m"
+        red = "\033[31m"
+        green = "\033[32m"
+        orange = "\033[33m"
+        blue = "\033[34m"
+        purple = "\033[35m"
+        cyan = "\033[36m"
+        lightgrey = "\033[37m"
+        darkgrey = "\033[90m"
+        lightred = "\033[91m"
+        lightgreen = "\033[92m"
+        yellow = "\033[93m"
+        lightblue = "\033[94m"
+        pink = "\033[95m"
+        lightcyan = "\033[96m"
+
+    class BG:
+        black = "\033[40m"
+        red = "\033[41m"
+        green = "\033[42m"
+        orange = "\033[43m"
+        blue = "\033[44m"
+        purple = "\033[45m"
+        cyan = "\033[46m"
+        lightgrey = "\033[47m"
+
+
+def ctext(text: str, fg: Color.FG | str = "", bg: Color.BG | str = "") -> str:
+    return f"{fg}{bg}{text}{Color.reset}" if fg or bg else text
+
+
+def cprint(text: str, fg: Color.FG | str = "", bg: Color.BG | str = "") -> None:
+    print(ctext(text, fg, bg))
+
+
+def clear() -> None:
+    print("\n" * 30)
+
+
+def run_gracefully(func: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(*args, **kwargs)
+        except KeyboardInterrupt:
+            cprint("\n\nThank you for playing battleship!", fg=Color.FG.yellow)
+            print("Press Ctrl+C to exit")
+            try:
+                while True:
+                    sleep(1)
+            except KeyboardInterrupt:
+                return
+
+    return wrapper
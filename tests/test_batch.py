@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from battleship.ai import mask_array
+from battleship.batch import BatchEnv, HuntTarget
+from battleship.enums import Player, ShipState
+from battleship.errors import InvalidGuessError
+from battleship.simulation import simulate_batch
+from battleship.state import GameState
+
+
+def test_fire_matches_change_state_shot_for_shot():
+    env = BatchEnv(300, random_seed=0)
+    boards = []
+    for game in range(env.games):
+        board = GameState()
+        board.place_fleet(Player.ONE, env.fleet(game))
+        boards.append(board)
+    rng = np.random.default_rng(1)
+    orders = np.array([rng.permutation(100) for _ in range(env.games)])
+
+    for shot in range(100):
+        active = ~env.done
+        coords = np.stack(np.divmod(orders[:, shot], 10), axis=1)
+        results = env.fire(coords, active)
+        for game, board in enumerate(boards):
+            if not active[game]:
+                assert results[game] == ShipState.EMPTY.value
+                continue
+            update = board.change_state(Player.ONE, tuple(coords[game].tolist()))
+            # change_state reports the shot that ends the game as None
+            assert results[game] == (update or ShipState.SUNK).value
+            assert env.done[game] == (board.player1_ships_left == 0)
+
+    for game, board in enumerate(boards):
+        bits = board.player1_bits
+        assert (env.hits[game] == mask_array(bits.hits)).all()
+        assert (env.misses[game] == mask_array(bits.misses)).all()
+        assert (env.sunk[game] == mask_array(bits.sunk)).all()
+    assert env.done.all()
+
+
+def test_randomize_places_whole_fleets():
+    env = BatchEnv(500, random_seed=2)
+    for game in range(env.games):
+        board = GameState()
+        board.place_fleet(Player.ONE, env.fleet(game))
+        assert (mask_array(board.player1_bits.ships) == (env.ships[game] >= 0)).all()
+
+
+def test_fire_rejects_repeated_shots():
+    env = BatchEnv(4, random_seed=3)
+    coords = np.zeros((4, 2), dtype=np.int64)
+    env.fire(coords)
+    with pytest.raises(InvalidGuessError):
+        env.fire(coords)
+
+
+def test_hunt_target_scores_match_a_full_rescore():
+    env = BatchEnv(500, random_seed=4)
+    policy = HuntTarget(env, env.rng)
+    while not env.done.all():
+        coords = policy.guess()
+        results = env.fire(coords, ~env.done)
+        policy.update(coords, results)
+        active = ~env.done
+        rescored = policy.score(np.arange(env.games))
+        assert (policy.scores[active] == rescored[active]).all()
+
+
+def test_simulate_batch_summary():
+    summary = simulate_batch(200, random_seed=5, batch_size=64)
+    assert summary["strategy"] == "heuristic"
+    assert summary["games"] == 200
+    assert summary["player1_wins"] + summary["player2_wins"] == 200
+    # both sides need at least the 17 ship cells to sink a fleet
+    assert 2 * 17 - 1 <= summary["mean_shots"] <= 200
+    assert 0 < summary["mean_accuracy"] <= 1
+
+
+def test_simulate_batch_needs_a_batch_policy():
+    with pytest.raises(ValueError):
+        simulate_batch(10, strategy="density")
@@ -0,0 +1,55 @@
+from random import seed
+
+import pytest
+
+from battleship.bitboard import GameConfig, random_fleet
+from battleship.enums import Direction, Player
+from battleship.simulation import simulate_summary
+from battleship.state import GameState
+
+
+@pytest.mark.parametrize(
+    "width, height, fleet",
+    [
+        (0, 3, {"a": 1}),
+        (3, 3, {}),
+        (3, 3, {"a": 0}),
+        (4, 4, {"a": 5}),
+        (2, 2, {"a": 2, "b": 2, "c": 1}),
+    ],
+)
+def test_invalid_config(width, height, fleet):
+    with pytest.raises(ValueError):
+        GameConfig(width, height, fleet)
+
+
+def test_single_cell_ships():
+    config = GameConfig(3, 3, {"a": 1, "b": 1})
+    assert len(config.placements["a"]) == 9
+    board = GameState(config=config)
+    board.place_ship(Player.ONE, "a", 1, 1, Direction.VERTICAL)
+    board.place_ship(Player.ONE, "b", 2, 0, Direction.HORIZONTAL)
+    assert board.get_fleet(Player.ONE) == (
+        config.placement_index[("a", 1, 1, Direction.HORIZONTAL)],
+        config.placement_index[("b", 2, 0, Direction.HORIZONTAL)],
+    )
+
+
+def test_random_fleet_crowded():
+    # most ways to start this fleet leave no room for the rest
+    seed(0)
+    config = GameConfig(3, 3, {"a": 2, "b": 2, "c": 2, "d": 2, "e": 1})
+    for _ in range(50):
+        fleet = random_fleet(config)
+        occupied = 0
+        for placement in fleet:
+            assert not placement.mask & occupied
+            occupied |= placement.mask
+        assert occupied == (1 << 9) - 1
+
+
+def test_fleet_sunk_by_one_shot():
+    # player one can win before player two has fired at all
+    summary = simulate_summary(200, 0, "density", "density", GameConfig(5, 5, {"x": 1}))
+    assert summary["player1_wins"] > 0
+    assert 0.0 < summary["mean_accuracy"] <= 1.0
@@ -0,0 +1,64 @@
+from functools import partial
+from random import seed
+
+import numpy as np
+import pytest
+
+from battleship.ai import density_guess, opening_guess
+from battleship.bitboard import standard
+from battleship.book import OpeningBook, book_main
+from battleship.enums import Player
+from battleship.layouts import cache_path
+from battleship.state import GameState
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    # stand-in layout counts, so nothing is counted or read from the home
+    # directory; the most likely cell is (3, 7)
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    counts = np.ones((10, 10), dtype=np.int64)
+    counts[3, 7] = 2
+    np.save(cache_path(standard, str(cache_dir)), counts)
+    return str(cache_dir)
+
+
+def test_opening_guess_reads_the_cache_only(tmp_path, cache_dir):
+    empty = tmp_path / "empty"
+    assert opening_guess(GameState(), Player.TWO, cache_dir) == (3, 7)
+    assert opening_guess(GameState(), Player.TWO, str(empty)) != (3, 7)
+    assert not empty.exists()
+
+
+def test_missing_read_only_book(tmp_path, cache_dir):
+    book = OpeningBook(
+        partial(opening_guess, cache_dir=cache_dir),
+        density_guess,
+        path=str(tmp_path / "book"),
+        flag="r",
+    )
+    assert book(GameState(), Player.TWO) == (3, 7)
+    assert book.evaluated == 1
+    assert not (tmp_path / "book").exists()
+
+
+def test_precomputed_book(tmp_path, cache_dir, capsys):
+    path = str(tmp_path / "book")
+    book_main(["--plies", "4", "--path", path, "--cache-dir", cache_dir])
+    assert "saved to" in capsys.readouterr().out
+    book = OpeningBook(
+        partial(opening_guess, cache_dir=cache_dir),
+        density_guess,
+        plies=4,
+        path=path,
+        flag="r",
+    )
+    # the book covers shots that sink nothing, which four shots here do not
+    seed(0)
+    board = GameState()
+    board.place_ai_ships(Player.ONE)
+    for _ in range(4):
+        board.fire(Player.TWO, book(board, Player.TWO))
+    book.close()
+    assert book.evaluated == 0
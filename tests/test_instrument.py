@@ -0,0 +1,17 @@
+from random import seed
+
+from battleship.instrument import Instrumentation
+from battleship.simulation import play_ai_game
+
+
+def test_reset_while_enabled():
+    seed(0)
+    with Instrumentation() as instrumentation:
+        play_ai_game()
+        instrumentation.reset()
+        assert all(
+            histogram.count == 0 for histogram in instrumentation.histograms.values()
+        )
+        play_ai_game()
+        assert instrumentation.histograms["change_state"].count > 0
+        assert instrumentation.histograms["add_ship"].count == 10
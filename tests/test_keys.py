@@ -0,0 +1,37 @@
+from battleship.board import Board
+from battleship.enums import Player
+from battleship.keys import parse_keys
+
+
+def test_home_is_not_h():
+    assert parse_keys(b"\x1b[H\x1b[1~h") == (["h"], b"")
+
+
+def test_application_mode_arrows():
+    assert parse_keys(b"\x1bOA\x1bOB\x1bOC\x1bOD") == (["w", "s", "d", "a"], b"")
+
+
+def test_arrow_split_across_reads():
+    keys, partial = parse_keys(b"d\x1b[")
+    assert (keys, partial) == (["d"], b"\x1b[")
+    assert parse_keys(partial + b"A") == (["w"], b"")
+    keys, partial = parse_keys(b"\x1b")
+    assert (keys, partial) == ([], b"\x1b")
+    assert parse_keys(partial + b"OD") == (["a"], b"")
+
+
+def test_enter_and_other_keys():
+    assert parse_keys(b"\r\nW?x") == (["enter", "enter", "w"], b"")
+
+
+def test_keys_after_enter_carry_over(capsys):
+    board = Board()
+    board.place_ai_ships(Player.ONE)
+    board.place_ai_ships(Player.TWO)
+    board.held_keys = ["enter", "d", "enter"]
+    board.place_player_guess(Player.ONE)
+    assert board.player1_guesses == [(0, 0)]
+    assert board.held_keys == ["d", "enter"]
+    board.place_player_guess(Player.ONE)
+    assert board.player1_guesses == [(0, 0), (0, 1)]
+    assert board.held_keys == []
@@ -0,0 +1,51 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from battleship.bitboard import GameConfig, iter_bits
+from battleship.layouts import count_layouts, layout_counts
+
+
+def brute_force(config):
+    total = 0
+    counts = np.zeros(config.cells, dtype=np.int64)
+    for fleet in product(*config.placements.values()):
+        occupied = 0
+        for placement in fleet:
+            if placement.mask & occupied:
+                break
+            occupied |= placement.mask
+        else:
+            total += 1
+            counts[list(iter_bits(occupied))] += 1
+    return total, counts.reshape(config.height, config.width)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        GameConfig(3, 3, {"a": 1, "b": 1}),
+        GameConfig(4, 3, {"a": 3, "b": 2, "c": 2}),
+        GameConfig(4, 4, {"a": 4, "b": 3, "c": 2, "d": 1}),
+        GameConfig(5, 4, {"a": 3, "b": 3, "c": 2, "d": 2}),
+    ],
+    ids=repr,
+)
+def test_count_layouts(config):
+    total, counts = count_layouts(config)
+    expected_total, expected_counts = brute_force(config)
+    assert total == expected_total
+    assert (counts == expected_counts).all()
+
+
+def test_single_cell_count():
+    assert count_layouts(GameConfig(3, 3, {"a": 1, "b": 1}))[0] == 72
+
+
+def test_layout_counts_cache(tmp_path):
+    config = GameConfig(4, 3, {"a": 3, "b": 2, "c": 2})
+    counts = layout_counts(config, str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    layout_counts.cache_clear()
+    assert (layout_counts(config, str(tmp_path)) == counts).all()
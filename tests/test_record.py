@@ -0,0 +1,51 @@
+from random import seed
+
+import pytest
+
+from battleship.enums import Player
+from battleship.record import GameRecordReader, GameRecordWriter
+from battleship.simulation import play_ai_game
+from battleship.state import GameState
+
+
+def test_records_replay_to_the_games_written(tmp_path):
+    path = str(tmp_path / "games.bsgr")
+    seed(0)
+    boards = []
+    with GameRecordWriter(path) as writer:
+        for strategy in ("heuristic", "density") * 10:
+            board = GameState()
+            play_ai_game(board, strategy, "heuristic")
+            writer.write(board)
+            boards.append(board)
+
+    with GameRecordReader(path) as reader:
+        records = list(reader)
+    assert len(records) == len(boards)
+    for board, record in zip(boards, records):
+        replayed = record.replay()
+        assert record.player1_fleet == board.get_fleet(Player.ONE)
+        assert record.player2_fleet == board.get_fleet(Player.TWO)
+        assert replayed.player1_guesses == board.player1_guesses
+        assert replayed.player2_guesses == board.player2_guesses
+        assert replayed.snapshot() == board.snapshot()
+        assert replayed.game_ended
+
+
+def test_appending_keeps_earlier_records(tmp_path):
+    path = str(tmp_path / "games.bsgr")
+    seed(1)
+    for _ in range(2):
+        with GameRecordWriter(path) as writer:
+            board = GameState()
+            play_ai_game(board)
+            writer.write(board)
+    with GameRecordReader(path) as reader:
+        assert len(list(reader)) == 2
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a record file")
+    with pytest.raises(ValueError):
+        GameRecordReader(str(path))
@@ -0,0 +1,87 @@
+from random import seed
+from time import perf_counter
+
+import numpy as np
+
+from battleship.ai import (
+    MonteCarloGuess,
+    SearchGuess,
+    placement_heat,
+    placement_ids,
+    sample_fleet,
+)
+from battleship.bitboard import GameConfig, iter_bits, mask_coords
+from battleship.enums import Player, ShipState
+from battleship.state import GameState
+from battleship.symmetry import ZOBRIST_MASK, zobrist_keys
+
+# generous for a loaded machine; a move that ignored its budget would take
+# several times as long
+TOLERANCE = 0.05
+
+
+def play(board, guess, budget=None):
+    board.place_ai_ships(Player.ONE)
+    while board.player1_ships_left:
+        start = perf_counter()
+        coord = guess(board, Player.TWO)
+        elapsed = perf_counter() - start
+        assert board.can_fire(Player.TWO, coord), coord
+        if budget is not None:
+            assert elapsed < budget + TOLERANCE, elapsed
+        board.fire(Player.TWO, coord)
+    return board
+
+
+def test_search_stays_legal_and_within_budget():
+    seed(0)
+    guess = SearchGuess(samples=200, min_samples=80, budget=0.02)
+    # the first move also builds the standard board's tables
+    guess(GameState(), Player.TWO)
+    board = play(GameState(), guess, guess.search_budget)
+    assert board.player2_shots < 100
+
+
+def test_transposition_table_is_reused():
+    seed(1)
+    guess = SearchGuess(budget=1.0, max_depth=2)
+    board = GameState()
+    board.place_ai_ships(Player.ONE)
+    for _ in range(5):
+        root = board.player1_hash & ZOBRIST_MASK
+        row, col = guess(board, Player.TWO)
+        table = board.ai_cache[(guess, Player.TWO, "table")]
+        if board.fire(Player.TWO, (row, col)) == ShipState.SUNK:
+            continue
+        miss_keys, hit_keys, _ = zobrist_keys(board.config)
+        cell = row * 10 + col
+        hit = board.player1_bits.hits >> cell & 1
+        child = root ^ (hit_keys if hit else miss_keys)[cell] & ZOBRIST_MASK
+        # the position just played was valued while searching the last move
+        assert child == board.player1_hash & ZOBRIST_MASK
+        assert (child, 0, 1) in table
+
+
+def test_rectangular_board():
+    config = GameConfig(12, 7, {"a": 5, "b": 4, "c": 3, "d": 2, "e": 1})
+    seed(2)
+    play(GameState(config=config), MonteCarloGuess(samples=200, min_samples=80))
+    seed(3)
+    play(GameState(config=config), SearchGuess(samples=100, min_samples=40))
+
+
+def test_placement_heat_counts_cells():
+    config = GameConfig(9, 6, {"a": 4, "b": 3, "c": 1})
+    seed(4)
+    ids = placement_ids(config)
+    masks = [
+        mask
+        for _ in range(50)
+        for _, mask, _ in sample_fleet(list(config.fleet), 0, 0, config)
+    ]
+    expected = np.zeros((config.height, config.width))
+    for mask in masks:
+        for x, y in mask_coords(mask, config.width):
+            expected[y, x] += 1
+    assert (placement_heat([ids[mask] for mask in masks], config) == expected).all()
+    assert sum(len(list(iter_bits(mask))) for mask in masks) == expected.sum()
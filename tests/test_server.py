@@ -0,0 +1,97 @@
+import asyncio
+
+from battleship.enums import Direction, Player, ShipState, ship_names
+from battleship.server import ErrorCode, GameServer, Opcode, encode, read_message
+
+# each player's ships lie along rows 0-4 from the left edge, below is water
+SHIP_CELLS = [
+    row * 10 + col
+    for row, value in enumerate(ship_names.values())
+    for col in range(value.value)
+]
+
+
+async def connect(port):
+    return await asyncio.open_connection("127.0.0.1", port)
+
+
+async def expect(reader, opcode):
+    message, fields = await asyncio.wait_for(read_message(reader), 5)
+    assert message == opcode, (message, fields)
+    return fields
+
+
+async def join_and_place(port, game_id):
+    clients = []
+    for player in Player:
+        reader, writer = await connect(port)
+        writer.write(encode(Opcode.JOIN, game_id))
+        joined_id, number = await expect(reader, Opcode.JOINED)
+        assert number == player.value
+        for ship in range(len(ship_names)):
+            writer.write(
+                encode(Opcode.PLACE, ship, 0, ship, Direction.HORIZONTAL.value)
+            )
+            assert await expect(reader, Opcode.PLACED) == (ship,)
+        clients.append((reader, writer))
+    for reader, _ in clients:
+        assert await expect(reader, Opcode.START) == (Player.ONE.value,)
+    return clients
+
+
+async def play_to_the_end():
+    server = GameServer(linger=0.1)
+    port = await server.start()
+    try:
+        (reader1, writer1), (reader2, writer2) = await join_and_place(port, 0)
+        for shot, cell in enumerate(SHIP_CELLS):
+            writer1.write(encode(Opcode.FIRE, cell))
+            for reader in (reader1, reader2):
+                player, fired, state = await expect(reader, Opcode.RESULT)
+                assert (player, fired) == (Player.ONE.value, cell)
+                assert state != ShipState.WRONG_GUESS.value
+            if shot == len(SHIP_CELLS) - 1:
+                break
+            writer2.write(encode(Opcode.FIRE, 50 + shot))
+            for reader in (reader1, reader2):
+                player, _, state = await expect(reader, Opcode.RESULT)
+                assert (player, state) == (
+                    Player.TWO.value,
+                    ShipState.WRONG_GUESS.value,
+                )
+        for reader in (reader1, reader2):
+            assert await expect(reader, Opcode.OVER) == (Player.ONE.value,)
+        assert not server.games
+        for writer in (writer1, writer2):
+            writer.close()
+    finally:
+        await server.stop()
+
+
+async def forfeit_then_rejoin():
+    server = GameServer(linger=0.1)
+    port = await server.start()
+    try:
+        (reader1, writer1), (_, writer2) = await join_and_place(port, 7)
+        writer2.close()
+        assert await expect(reader1, Opcode.OVER) == (Player.ONE.value,)
+        assert 7 not in server.games
+
+        # the id is free again, but only as a new game that has not started
+        reader3, writer3 = await connect(port)
+        writer3.write(encode(Opcode.JOIN, 7))
+        assert await expect(reader3, Opcode.JOINED) == (7, Player.ONE.value)
+        writer3.write(encode(Opcode.FIRE, 0))
+        assert await expect(reader3, Opcode.ERROR) == (ErrorCode.PROTOCOL.value,)
+        for writer in (writer1, writer3):
+            writer.close()
+    finally:
+        await server.stop()
+
+
+def test_game_over_localhost():
+    asyncio.run(play_to_the_end())
+
+
+def test_forfeit_then_rejoin():
+    asyncio.run(forfeit_then_rejoin())
@@ -0,0 +1,118 @@
+from random import sample, seed
+
+import pytest
+
+from battleship.bitboard import GameConfig
+from battleship.enums import Direction, Player
+from battleship.simulation import play_ai_game
+from battleship.state import GameState
+from battleship.symmetry import zobrist_hash
+
+FIELDS = (
+    "ai_strategy",
+    "config",
+    "player1_ships",
+    "player2_ships",
+    "player1_ship_bits",
+    "player2_ship_bits",
+    "player1_cells",
+    "player2_cells",
+    "player1_ship_hp",
+    "player2_ship_hp",
+    "player1_ships_left",
+    "player2_ships_left",
+    "player1_guesses",
+    "player2_guesses",
+    "player1_shots",
+    "player2_shots",
+    "player1_hash",
+    "player2_hash",
+)
+
+
+def assert_same_game(state: GameState, other: GameState) -> None:
+    for field in FIELDS:
+        assert getattr(state, field) == getattr(other, field), field
+    for player in ("player1", "player2"):
+        bits = getattr(state, f"{player}_bits")
+        other_bits = getattr(other, f"{player}_bits")
+        for mask in ("ships", "hits", "misses", "sunk"):
+            assert getattr(bits, mask) == getattr(other_bits, mask), mask
+
+
+def midgame(shots: int) -> GameState:
+    board = GameState("density")
+    board.place_ai_ships(Player.ONE)
+    board.place_ai_ships(Player.TWO)
+    cells = [(row, col) for row in range(10) for col in range(10)]
+    for player1_shot, player2_shot in zip(sample(cells, shots), sample(cells, shots)):
+        board.fire(Player.ONE, player1_shot)
+        board.fire(Player.TWO, player2_shot)
+    return board
+
+
+@pytest.mark.parametrize("shots", [0, 1, 30, 60])
+def test_snapshot_round_trip_midgame(shots):
+    seed(shots)
+    board = midgame(shots)
+    snapshot = board.snapshot()
+    restored = GameState.from_snapshot(snapshot)
+    assert_same_game(restored, board)
+    assert restored.snapshot() == snapshot
+
+
+def test_snapshot_round_trip_finished_games():
+    seed(2)
+    for _ in range(20):
+        board = GameState()
+        play_ai_game(board)
+        restored = GameState.from_snapshot(board.snapshot())
+        assert_same_game(restored, board)
+        assert restored.game_ended
+
+
+def test_restore_rewinds_in_place():
+    seed(3)
+    board = midgame(10)
+    snapshot = board.snapshot()
+    expected = board.copy()
+    board.place_ai_guess(Player.ONE)
+    board.place_ai_guess(Player.TWO)
+    board.restore(snapshot)
+    assert_same_game(board, expected)
+
+
+def test_copy_is_independent():
+    seed(4)
+    board = midgame(10)
+    copy = board.copy()
+    copy.place_ai_guess(Player.ONE)
+    assert board.player1_shots == 10
+    assert copy.player1_shots == 11
+    assert board.player2_bits.guessed != copy.player2_bits.guessed
+
+
+def test_snapshot_needs_the_standard_board():
+    board = GameState(config=GameConfig(12, 12))
+    with pytest.raises(ValueError):
+        board.snapshot()
+
+
+def test_hash_tells_apart_the_ships_left():
+    # five sunk cells in a row are either the 2 and the 3 or the 5
+    config = GameConfig(10, 1, {"a": 2, "b": 3, "c": 5})
+    boards = []
+    for layout in ({"a": 0, "b": 2, "c": 5}, {"c": 0, "a": 5, "b": 7}):
+        board = GameState(config=config)
+        for ship, x in layout.items():
+            board.place_ship(Player.ONE, ship, x, 0, Direction.HORIZONTAL)
+        for x in range(5):
+            board.fire(Player.TWO, (0, x))
+        boards.append(board)
+    first, second = boards
+    assert first.player1_bits.sunk == second.player1_bits.sunk
+    assert first.state_hash(Player.ONE) != second.state_hash(Player.ONE)
+    for board, sunk_lengths in zip(boards, ([2, 3], [5])):
+        assert board.player1_hash == zobrist_hash(
+            board.player1_bits, config, sunk_lengths
+        )